@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from api import signals  # noqa: F401
+        from api.middleware import install_query_recorder
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from api_yamdb.db import close_unusable_connections
+        connection_created.connect(install_query_recorder)
+        request_started.connect(close_unusable_connections)
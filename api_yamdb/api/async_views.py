@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from functools import wraps
+from queue import Full, Queue
+
+from api.middleware import current_stats
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.urls import URLPattern
+from rest_framework.permissions import SAFE_METHODS
+
+# Имена маршрутов роутера, которые отдаются асинхронными представлениями.
+ASYNC_READ_ROUTES = (
+    'titles-list', 'titles-detail', 'reviews-list', 'comments-list',
+)
+
+
+def run_view(view, request, args, kwargs, thread_pool):
+    current_stats.set(getattr(request, 'performance_stats', None))
+    try:
+        return view(request, *args, **kwargs)
+    finally:
+        # Поток пула не получает request_finished: соединение закрывается
+        # (или возвращается в пул) по правилам CONN_MAX_AGE здесь же.
+        if thread_pool:
+            close_old_connections()
+
+
+def async_read(view):
+    """
+    Асинхронная обёртка над представлением DRF. В Django 3.2 нет
+    асинхронного ORM, поэтому чтения выполняются в пуле потоков
+    sync_to_async, и медленный клиент не занимает поток воркера.
+    Изменяющие запросы идут в общий поток, как обычные sync-представления.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        thread_pool = (
+            request.method in SAFE_METHODS and settings.ASYNC_READ_THREAD_POOL
+        )
+        return await sync_to_async(
+            run_view, thread_sensitive=not thread_pool,
+        )(view, request, args, kwargs, thread_pool)
+
+    return wrapper
+
+
+def async_reads(patterns):
+    """Заменяет представления маршрутов ASYNC_READ_ROUTES на асинхронные."""
+    return [
+        URLPattern(
+            pattern.pattern, async_read(pattern.callback),
+            pattern.default_args, pattern.name,
+        ) if pattern.name in ASYNC_READ_ROUTES else pattern
+        for pattern in patterns
+    ]
+
+
+class ThreadedIterator:
+    """Генератор в отдельном потоке, части передаются через очередь."""
+
+    def __init__(self, iterable, buffer_size):
+        self.iterable = iterable
+        self.queue = Queue(maxsize=buffer_size)
+        self.stopped = threading.Event()
+
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+            except Full:
+                continue
+            return True
+        return False
+
+    def produce(self):
+        try:
+            for part in self.iterable:
+                if not self.put((True, part)):
+                    return
+            self.put((False, None))
+        except Exception as error:
+            self.put((False, error))
+        finally:
+            connections.close_all()
+
+    def __iter__(self):
+        threading.Thread(target=self.produce, daemon=True).start()
+        try:
+            while True:
+                has_part, value = self.queue.get()
+                if not has_part:
+                    if value is not None:
+                        raise value
+                    return
+                yield value
+        finally:
+            self.stopped.set()
+
+
+def sync_iterator(iterable, buffer_size=8):
+    """
+    Перебирает генератор, читающий из базы. ASGI-обработчик Django 3.2
+    итерирует StreamingHttpResponse в потоке цикла событий, где ORM
+    запрещён, поэтому там генератор работает в отдельном потоке.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        yield from iterable
+        return
+    yield from ThreadedIterator(iterable, buffer_size)
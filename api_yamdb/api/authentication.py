@@ -0,0 +1,49 @@
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from users.models import User
+from users.tokens import get_token_version
+
+
+class ClaimsUser(TokenUser):
+    """Пользователь, собранный из утверждений токена без запроса к базе."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', User.USER)
+
+    @property
+    def is_user(self):
+        return self.role == User.USER
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация, не загружающая пользователя из базы: отзыв токена
+    проверяется по закэшированной версии токенов пользователя.
+    """
+
+    def get_user(self, validated_token):
+        if 'token_version' not in validated_token:
+            # Токены, выпущенные до появления версий, проверяются по базе.
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя'
+            )
+        if validated_token['token_version'] != get_token_version(user_id):
+            raise AuthenticationFailed('Токен отозван', code='token_revoked')
+        return ClaimsUser(validated_token)
@@ -0,0 +1,289 @@
+import ipaddress
+import math
+import random
+import time
+import tracemalloc
+
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.test import Client
+from reviews.leaderboard import rebuild as rebuild_leaderboards
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+SCALES = {
+    'tiny': {
+        'users': 20, 'categories': 3, 'genres': 5,
+        'titles': 50, 'reviews': 200, 'comments': 400,
+    },
+    'small': {
+        'users': 1000, 'categories': 10, 'genres': 30,
+        'titles': 1000, 'reviews': 10000, 'comments': 20000,
+    },
+    'medium': {
+        'users': 10000, 'categories': 20, 'genres': 50,
+        'titles': 10000, 'reviews': 500000, 'comments': 1000000,
+    },
+    'large': {
+        'users': 100000, 'categories': 30, 'genres': 100,
+        'titles': 100000, 'reviews': 5000000, 'comments': 20000000,
+    },
+}
+BENCHMARK_PREFIX = 'bench'
+
+
+def batched(objects, batch_size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(sizes, batch_size=10000, random_seed=0):
+    """
+    Заполняет базу синтетическими данными через bulk_create.
+    Данные детерминированы: одинаковые sizes и random_seed дают одну базу.
+    Каждая пачка фиксируется своей транзакцией, чтобы не держать
+    блокировки и журнал на весь объём данных.
+    """
+    rng = random.Random(random_seed)
+    if sizes['reviews'] > sizes['titles'] * sizes['users']:
+        raise ValueError('Отзывов больше, чем пар пользователь-произведение')
+
+    def create(model, objects):
+        # Ключи созданной пачки: выше максимального ключа до вставки.
+        start = model.objects.aggregate(start=Max('pk'))['start'] or 0
+        for batch in batched(objects, batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+        return list(
+            model.objects.filter(pk__gt=start)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    user_ids = create(User, (
+        User(
+            username=f'{BENCHMARK_PREFIX}{i}',
+            email=f'{BENCHMARK_PREFIX}{i}@yamdb.fake',
+        )
+        for i in range(sizes['users'])
+    ))
+    category_ids = create(Category, (
+        Category(name=f'Категория {i}', slug=f'{BENCHMARK_PREFIX}-cat-{i}')
+        for i in range(sizes['categories'])
+    ))
+    genre_ids = create(Genre, (
+        Genre(name=f'Жанр {i}', slug=f'{BENCHMARK_PREFIX}-genre-{i}')
+        for i in range(sizes['genres'])
+    ))
+    title_ids = create(Title, (
+        Title(
+            name=f'Произведение {i}',
+            year=rng.randint(1900, 2020),
+            description=f'Описание произведения {i}',
+            category_id=rng.choice(category_ids),
+        )
+        for i in range(sizes['titles'])
+    ))
+    create(GenreTitle, (
+        GenreTitle(title_id=title_id, genre_id=genre_id)
+        for title_id in title_ids
+        for genre_id in rng.sample(genre_ids, min(3, len(genre_ids)))
+    ))
+    # Отзыв i относится к произведению i % T от автора i // T: пары уникальны.
+    review_ids = create(Review, (
+        Review(
+            title_id=title_ids[i % len(title_ids)],
+            author_id=user_ids[i // len(title_ids)],
+            text=f'Отзыв {i}',
+            score=rng.randint(1, 10),
+        )
+        for i in range(sizes['reviews'])
+    ))
+    for batch in batched(range(sizes['comments']), batch_size):
+        with transaction.atomic():
+            Comment.objects.bulk_create([
+                Comment(
+                    review_id=review_ids[i % len(review_ids)],
+                    author_id=rng.choice(user_ids),
+                    text=f'Комментарий {i}',
+                )
+                for i in batch
+            ])
+    with transaction.atomic():
+        Title.objects.all().rebuild_ratings()
+        rebuild_leaderboards(batch_size)
+
+
+def percentile(values, percent):
+    """Перцентиль методом ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def request_queries(response):
+    """
+    Число SQL-запросов по учёту PerformanceMiddleware: в отличие от
+    CaptureQueriesContext он видит и соединения потоков пула async_read.
+    """
+    return len(response.wsgi_request.performance_stats.queries)
+
+
+class Benchmark:
+    """Прогон сценариев через URLconf приложения тестовым клиентом Django."""
+
+    def __init__(self, requests=100, cold=False, random_seed=0):
+        self.requests = requests
+        self.cold = cold
+        self.rng = random.Random(random_seed)
+        self.client = Client()
+        self.title_ids = list(
+            Title.objects.filter(
+                reviews_count__gt=0,
+            ).order_by('pk').values_list('pk', flat=True)[:1000]
+        )
+        self.review_ids = list(
+            Review.objects.filter(
+                title_id__in=self.title_ids[:100],
+            ).order_by('pk').values_list('pk', 'title_id')[:1000]
+        )
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.signups = 0
+
+    def scenarios(self):
+        return {
+            'titles_list': self.titles_list,
+            'titles_filter': self.titles_filter,
+            'reviews_page': self.reviews_page,
+            'comments_page': self.comments_page,
+            'signup': self.signup,
+            'token': self.token,
+        }
+
+    def titles_list(self):
+        offset = self.rng.randrange(0, max(len(self.title_ids), 1))
+        return lambda: self.client.get(
+            '/api/v1/titles/', {'limit': 100, 'offset': offset},
+        )
+
+    def titles_filter(self):
+        params = {'year': self.rng.randint(1900, 2020)}
+        if self.genres:
+            params['genre'] = self.rng.choice(self.genres)
+        return lambda: self.client.get('/api/v1/titles/', params)
+
+    def reviews_page(self):
+        title_id = self.rng.choice(self.title_ids)
+        return lambda: self.client.get(
+            f'/api/v1/titles/{title_id}/reviews/', {'limit': 20},
+        )
+
+    def comments_page(self):
+        review_id, title_id = self.rng.choice(self.review_ids)
+        return lambda: self.client.get(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            {'limit': 20},
+        )
+
+    def next_signup(self):
+        self.signups += 1
+        username = f'{BENCHMARK_PREFIX}-signup-{time.time_ns()}-{self.signups}'
+        return {'username': username, 'email': f'{username}@yamdb.fake'}
+
+    def next_address(self):
+        """Свой адрес на каждую регистрацию: лимит запросов не срабатывает."""
+        return str(ipaddress.IPv4Address('10.0.0.0') + self.signups)
+
+    def signup(self):
+        data = self.next_signup()
+        address = self.next_address()
+        return lambda: self.client.post(
+            '/api/v1/auth/signup/', data, REMOTE_ADDR=address,
+        )
+
+    def token(self):
+        data = self.next_signup()
+        address = self.next_address()
+        self.client.post('/api/v1/auth/signup/', data, REMOTE_ADDR=address)
+        user = User.objects.get(username=data['username'])
+        code = PasswordResetTokenGenerator().make_token(user)
+        return lambda: self.client.post('/api/v1/auth/token/', {
+            'username': user.username, 'confirmation_code': code,
+        }, REMOTE_ADDR=address)
+
+    def timed_requests(self, prepare):
+        """Выполняет запросы сценария, возвращая ответы и их задержку."""
+        for _ in range(self.requests):
+            request = prepare()
+            if self.cold:
+                cache.clear()
+            started = time.perf_counter()
+            response = request()
+            yield response, time.perf_counter() - started
+
+    def run_scenario(self, prepare):
+        latencies = []
+        queries = []
+        errors = 0
+        for response, latency in self.timed_requests(prepare):
+            latencies.append(latency)
+            queries.append(request_queries(response))
+            if response.status_code >= 400:
+                errors += 1
+        # Пиковая память — отдельным прогоном: tracemalloc в разы
+        # замедляет выделение памяти и исказил бы перцентили задержки.
+        tracemalloc.start()
+        try:
+            for _ in self.timed_requests(prepare):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            'requests': self.requests,
+            'errors': errors,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'queries_per_request': sum(queries) / len(queries),
+            'peak_memory_kb': peak / 1024,
+        }
+
+    def run(self, names=None):
+        scenarios = self.scenarios()
+        return {
+            name: self.run_scenario(prepare)
+            for name, prepare in scenarios.items()
+            if not names or name in names
+        }
+
+
+def compare(baseline, current, threshold):
+    """
+    Сравнивает результаты с базовыми. Возвращает строки отчёта и список
+    метрик, ухудшившихся больше чем на threshold процентов.
+    """
+    lines = []
+    regressions = []
+    metrics = ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request',
+               'peak_memory_kb')
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in metrics:
+            old, new = base[metric], result[metric]
+            change = (new - old) / old * 100 if old else 0.0
+            lines.append(
+                f'{name}.{metric}: {old:.2f} -> {new:.2f} ({change:+.1f}%)'
+            )
+            if change > threshold:
+                regressions.append(f'{name}.{metric}')
+    return lines, regressions
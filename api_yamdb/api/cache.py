@@ -0,0 +1,152 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import urlencode
+from rest_framework.response import Response
+
+from api_yamdb.db.router import read_replica
+
+VERSION_KEY = 'response-cache:version:{}'
+MODIFIED_KEY = 'response-cache:modified:{}'
+RESPONSE_KEY = 'response-cache:{}:{}:{}'
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_version(resource):
+    """Возвращает текущую версию ресурса."""
+    cache = get_cache()
+    key = VERSION_KEY.format(resource)
+    version = cache.get(key)
+    if version is None:
+        # Версия, вытесненная из кэша, не должна совпасть с прежней.
+        cache.add(key, int(time.time() * 1000), None)
+        return cache.get(key)
+    return version
+
+
+def bump_version(*resources):
+    """Увеличивает версии ресурсов, делая их кэш устаревшим."""
+    cache = get_cache()
+    for resource in resources:
+        key = VERSION_KEY.format(resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+    cache.set_many({
+        MODIFIED_KEY.format(resource): time.time() for resource in resources
+    }, None)
+
+
+def get_modified(resource):
+    """Время последнего изменения ресурса, unix timestamp."""
+    cache = get_cache()
+    key = MODIFIED_KEY.format(resource)
+    modified = cache.get(key)
+    if modified is None:
+        # Время неизвестно: считаем, что ресурс изменился сейчас.
+        cache.add(key, time.time(), None)
+        return cache.get(key)
+    return modified
+
+
+def replica_settled(resource):
+    """
+    Ответ, прочитанный с реплики вскоре после записи, может быть устаревшим
+    и не должен попасть в кэш под новой версией ресурса.
+    """
+    if read_replica.get() is None:
+        return True
+    return time.time() - get_modified(resource) >= settings.REPLICA_PIN_SECONDS
+
+
+def _increment(key):
+    cache = get_cache()
+    if not cache.add(key, 1, None):
+        cache.incr(key)
+
+
+def cache_stats():
+    """Счётчики попаданий и промахов кэша ответов."""
+    cache = get_cache()
+    return {
+        'hits': cache.get(HITS_KEY, 0),
+        'misses': cache.get(MISSES_KEY, 0),
+    }
+
+
+class CacheInvalidationMixin:
+    """Сбрасывает кэш перечисленных ресурсов после записи."""
+
+    cache_invalidates = ()
+
+    def invalidate_cache(self):
+        transaction.on_commit(lambda: bump_version(*self.cache_invalidates))
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self.invalidate_cache()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.invalidate_cache()
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        self.invalidate_cache()
+
+
+class CachedResponseMixin(CacheInvalidationMixin):
+    """Кэширует ответы на чтение с ключом из URL, параметров и версии."""
+
+    cache_resource = None
+
+    def get_cache_key(self, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        digest = hashlib.md5(
+            f'{request.path}?{query}'.encode()
+        ).hexdigest()
+        return RESPONSE_KEY.format(
+            self.cache_resource, get_version(self.cache_resource), digest,
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            _increment(HITS_KEY)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        _increment(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if (
+            response.status_code == 200
+            and replica_settled(self.cache_resource)
+        ):
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
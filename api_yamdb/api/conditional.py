@@ -0,0 +1,70 @@
+import hashlib
+
+from api.cache import get_modified, get_version, replica_settled
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from api_yamdb.db.router import read_replica
+
+
+def make_etag(*parts):
+    return quote_etag(
+        hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+    )
+
+
+class ConditionalGetMixin:
+    """
+    ETag и Last-Modified для ответов на чтение. Валидаторы считаются до
+    выборки и сериализации, поэтому при совпадении 304 отдаётся сразу.
+    """
+
+    def get_validators(self, request):
+        """Возвращает пару (etag, last_modified) для текущего запроса."""
+        raise NotImplementedError
+
+    def resource_validators(self, request, resource, queryset=None):
+        """
+        Валидаторы по версии ресурса. Для списков добавляются число строк
+        и MAX(pub_date): они меняются и при записи в обход сигналов.
+        """
+        if not replica_settled(resource):
+            # Реплика могла не догнать недавнюю запись: тело под новой
+            # версией ресурса читается с основной базы, иначе клиент
+            # получал бы 304 на устаревшие данные до следующей записи.
+            read_replica.set(None)
+        parts = [
+            get_version(resource), request.get_full_path(),
+            request.accepted_renderer.format,
+        ]
+        modified = get_modified(resource)
+        if queryset is not None:
+            stats = queryset.aggregate(count=Count('id'), last=Max('pub_date'))
+            parts += [stats['count'], stats['last']]
+            if stats['last'] is not None:
+                modified = max(modified, stats['last'].timestamp())
+        return make_etag(*parts), int(modified)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,144 @@
+from collections import defaultdict
+
+from api.middleware import timed_serialization
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+from rest_framework.response import Response
+
+# Быстрые эквиваленты to_representation простых полей DRF.
+CONVERTERS = {
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.CharField: str,
+}
+MANY_FIELDS = (ManyRelatedField, serializers.ListSerializer)
+PLAIN, ONE, MANY = range(3)
+
+
+def converter(field):
+    return CONVERTERS.get(type(field), field.to_representation)
+
+
+class SlugColumn:
+    """Связь, выводимая одним столбцом связанной модели."""
+
+    def __init__(self, column):
+        self.columns = [column]
+        self.column = column
+
+    def build(self, row):
+        return row[self.column]
+
+
+class CompiledSerializer:
+    """
+    Вывод ModelSerializer только для чтения: поля сериализатора заранее
+    разбираются в столбцы values() и функции преобразования, связи
+    «один» читаются через JOIN, «многие» — одним запросом к промежуточной
+    таблице. Экземпляры моделей и to_representation по полям не нужны,
+    результат совпадает с serializer.data.
+    """
+
+    def __init__(self, serializer, prefix=''):
+        self.model = serializer.Meta.model
+        self.columns = []
+        self.plan = []
+        self.many = {}
+        for name, field in serializer.fields.items():
+            if isinstance(field, MANY_FIELDS):
+                model_field = self.model._meta.get_field(field.source)
+                child = getattr(field, 'child_relation', None) or field.child
+                self.many[name] = (
+                    model_field,
+                    self.compile_related(
+                        child, model_field.m2m_reverse_field_name() + '__',
+                    ),
+                )
+                self.plan.append((name, MANY, None))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                model_field = self.model._meta.get_field(field.source)
+                self.add_plain(name, prefix + model_field.attname, int)
+            elif isinstance(field, (RelatedField, serializers.BaseSerializer)):
+                model_field = self.model._meta.get_field(field.source)
+                key = prefix + model_field.attname
+                related = self.compile_related(
+                    field, f'{prefix}{field.source}__',
+                )
+                self.columns += [key, *related.columns]
+                self.plan.append((name, ONE, (key, related)))
+            else:
+                self.add_plain(name, prefix + field.source, converter(field))
+        if not prefix:
+            # Ключ строки: по нему собираются связи «многие» и ответы по id.
+            self.columns.append('pk')
+
+    def add_plain(self, name, column, convert):
+        self.columns.append(column)
+        self.plan.append((name, PLAIN, (column, convert)))
+
+    def compile_related(self, field, prefix):
+        if isinstance(field, serializers.BaseSerializer):
+            return CompiledSerializer(field, prefix)
+        return SlugColumn(prefix + field.slug_field)
+
+    def values(self, queryset):
+        return queryset.select_related(None).prefetch_related(None).values(
+            *self.columns
+        )
+
+    def load_many(self, rows):
+        maps = {}
+        ids = [row['pk'] for row in rows]
+        for name, (model_field, related) in self.many.items():
+            through = model_field.remote_field.through
+            source = model_field.m2m_field_name() + '_id'
+            target = model_field.m2m_reverse_field_name() + '_id'
+            # Связи с удалённым объектом (SET_NULL) prefetch тоже пропускает.
+            links = through.objects.filter(**{
+                f'{source}__in': ids, f'{target}__isnull': False,
+            }).order_by(source, target).values(source, *related.columns)
+            grouped = defaultdict(list)
+            for link in links:
+                grouped[link[source]].append(related.build(link))
+            maps[name] = grouped
+        return maps
+
+    def build(self, row, maps=None):
+        data = {}
+        for name, kind, spec in self.plan:
+            if kind == MANY:
+                data[name] = maps[name].get(row['pk'], [])
+            elif kind == ONE:
+                key, related = spec
+                data[name] = None if row[key] is None else related.build(row)
+            else:
+                column, convert = spec
+                value = row[column]
+                data[name] = None if value is None else convert(value)
+        return data
+
+    def serialize(self, rows):
+        maps = self.load_many(rows) if self.many and rows else {}
+        return [self.build(row, maps) for row in rows]
+
+
+class FastListMixin:
+    """
+    list() через CompiledSerializer. Пагинатор режет выборку values(),
+    поэтому экземпляры моделей не создаются вовсе.
+    """
+
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return super().list(request, *args, **kwargs)
+        compiled = CompiledSerializer(self.get_serializer())
+        queryset = compiled.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        with timed_serialization():
+            data = compiled.serialize(rows)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
@@ -0,0 +1,103 @@
+import json
+import subprocess
+
+from api.benchmark import Benchmark, compare
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from reviews.models import Comment, Review, Title
+
+
+class Command(BaseCommand):
+    help = 'Замер задержки, числа SQL-запросов и памяти основных сценариев API'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Количество запросов в каждом сценарии',
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Запустить только указанные сценарии',
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Очищать кеш ответов перед каждым запросом',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора случайных чисел',
+        )
+        parser.add_argument(
+            '--output', help='Сохранить результаты в JSON-файл',
+        )
+        parser.add_argument(
+            '--baseline', help='JSON-файл с результатами для сравнения',
+        )
+        parser.add_argument(
+            '--max-regression', type=float,
+            help='Завершиться ошибкой, если метрика хуже базовой '
+                 'больше чем на указанный процент',
+        )
+
+    def handle(self, *args, **options):
+        if not Title.objects.filter(reviews_count__gt=0).exists():
+            raise CommandError(
+                'Нет произведений с отзывами, сначала выполните seed_benchmark'
+            )
+        benchmark = Benchmark(
+            options['requests'], options['cold'], options['seed'],
+        )
+        results = benchmark.run(options['scenarios'])
+        for name, result in results.items():
+            print(
+                f'{name}: p50 {result["p50_ms"]:.1f} мс, '
+                f'p95 {result["p95_ms"]:.1f} мс, '
+                f'p99 {result["p99_ms"]:.1f} мс, '
+                f'SQL {result["queries_per_request"]:.1f}, '
+                f'память {result["peak_memory_kb"]:.0f} КБ, '
+                f'ошибок {result["errors"]}'
+            )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump({
+                    'meta': self.meta(options),
+                    'scenarios': results,
+                }, file, ensure_ascii=False, indent=2)
+            print(f'Результаты сохранены в {options["output"]}')
+        if options['baseline']:
+            self.compare(options['baseline'], results, options)
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True,
+                text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'created': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'requests': options['requests'],
+            'cold': options['cold'],
+            'seed': options['seed'],
+            'titles': Title.objects.count(),
+            'reviews': Review.objects.count(),
+            'comments': Comment.objects.count(),
+        }
+
+    def compare(self, path, results, options):
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)['scenarios']
+        threshold = options['max_regression']
+        lines, regressions = compare(
+            baseline, results,
+            threshold if threshold is not None else float('inf'),
+        )
+        print('\n'.join(lines))
+        if regressions:
+            raise CommandError(
+                'Ухудшились метрики: ' + ', '.join(regressions)
+            )
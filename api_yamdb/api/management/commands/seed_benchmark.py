@@ -0,0 +1,38 @@
+from api.benchmark import SCALES, seed
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Синтетические данные для замеров производительности'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', choices=SCALES, default='small',
+            help='Готовый размер набора данных',
+        )
+        for name in SCALES['small']:
+            parser.add_argument(
+                f'--{name}', type=int,
+                help=f'Переопределить количество объектов: {name}',
+            )
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Количество объектов в одном bulk_create',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора случайных чисел',
+        )
+
+    def handle(self, *args, **options):
+        sizes = {
+            name: options[name] if options[name] is not None else size
+            for name, size in SCALES[options['scale']].items()
+        }
+        try:
+            seed(sizes, options['batch_size'], options['seed'])
+        except ValueError as error:
+            raise CommandError(error)
+        print('Созданы данные: ' + ', '.join(
+            f'{name} {size}' for name, size in sizes.items()
+        ))
@@ -0,0 +1,166 @@
+import os
+import threading
+from collections import defaultdict
+
+from api.cache import cache_stats
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from api_yamdb.db.pool import pool_stats
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class ViewMetrics:
+    """Накопленные показатели одного представления."""
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+        self.render_time = 0.0
+        self.response_bytes = 0
+        self.statuses = defaultdict(int)
+
+
+class Registry:
+    """
+    Показатели процесса: каждый воркер копит свои, и у каждой серии есть
+    метка pid, чтобы серии разных воркеров не смешивались.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(ViewMetrics)
+        self.collectors = []
+
+    def observe(self, view, status, duration, queries, db_time,
+                serialization_time, render_time, response_bytes):
+        with self.lock:
+            metrics = self.views[view]
+            for index, bound in enumerate(BUCKETS):
+                if duration <= bound:
+                    metrics.buckets[index] += 1
+            metrics.count += 1
+            metrics.duration += duration
+            metrics.queries += queries
+            metrics.db_time += db_time
+            metrics.serialization_time += serialization_time
+            metrics.render_time += render_time
+            metrics.response_bytes += response_bytes
+            metrics.statuses[status] += 1
+
+    def register_collector(self, collector):
+        """Добавляет функцию, возвращающую строки метрик других подсистем."""
+        self.collectors.append(collector)
+
+    def render(self):
+        pid = os.getpid()
+        with self.lock:
+            views = {
+                view: metrics for view, metrics in sorted(self.views.items())
+            }
+            lines = [
+                '# TYPE yamdb_request_duration_seconds histogram',
+            ]
+            for view, metrics in views.items():
+                labels = f'view="{view}",pid="{pid}"'
+                for bound, count in zip(BUCKETS, metrics.buckets):
+                    lines.append(
+                        'yamdb_request_duration_seconds_bucket'
+                        f'{{{labels},le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    'yamdb_request_duration_seconds_bucket'
+                    f'{{{labels},le="+Inf"}} {metrics.count}'
+                )
+                lines.append(
+                    f'yamdb_request_duration_seconds_sum{{{labels}}} '
+                    f'{metrics.duration}'
+                )
+                lines.append(
+                    f'yamdb_request_duration_seconds_count{{{labels}}} '
+                    f'{metrics.count}'
+                )
+            counters = (
+                ('yamdb_request_db_queries_total', 'queries'),
+                ('yamdb_request_db_seconds_total', 'db_time'),
+                ('yamdb_request_serialization_seconds_total',
+                 'serialization_time'),
+                ('yamdb_request_render_seconds_total', 'render_time'),
+                ('yamdb_response_bytes_total', 'response_bytes'),
+            )
+            for name, attribute in counters:
+                lines.append(f'# TYPE {name} counter')
+                for view, metrics in views.items():
+                    value = getattr(metrics, attribute)
+                    lines.append(
+                        f'{name}{{view="{view}",pid="{pid}"}} {value}'
+                    )
+            lines.append('# TYPE yamdb_requests_total counter')
+            for view, metrics in views.items():
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'yamdb_requests_total{{view="{view}",pid="{pid}",'
+                        f'status="{status}"}} {count}'
+                    )
+        for collector in self.collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def response_cache_metrics():
+    stats = cache_stats()
+    return [
+        '# TYPE yamdb_response_cache_hits_total counter',
+        f'yamdb_response_cache_hits_total {stats["hits"]}',
+        '# TYPE yamdb_response_cache_misses_total counter',
+        f'yamdb_response_cache_misses_total {stats["misses"]}',
+    ]
+
+
+registry.register_collector(response_cache_metrics)
+
+
+def connection_pool_metrics():
+    stats = pool_stats()
+    if not stats:
+        return []
+    metrics = (
+        ('yamdb_db_pool_max_size', 'gauge', 'max_size'),
+        ('yamdb_db_pool_size', 'gauge', 'size'),
+        ('yamdb_db_pool_in_use', 'gauge', 'in_use'),
+        ('yamdb_db_pool_idle', 'gauge', 'idle'),
+        ('yamdb_db_pool_connections_created_total', 'counter', 'created'),
+        ('yamdb_db_pool_waits_total', 'counter', 'waits'),
+        ('yamdb_db_pool_wait_seconds_total', 'counter', 'wait_time'),
+        ('yamdb_db_pool_timeouts_total', 'counter', 'timeouts'),
+    )
+    # Пул у каждого процесса свой.
+    pid = os.getpid()
+    lines = []
+    for name, kind, key in metrics:
+        lines.append(f'# TYPE {name} {kind}')
+        for alias, values in stats.items():
+            lines.append(
+                f'{name}{{alias="{alias}",pid="{pid}"}} {values[key]}'
+            )
+    return lines
+
+
+registry.register_collector(connection_pool_metrics)
+
+
+def metrics_view(request):
+    """Метрики в текстовом формате Prometheus для внутренних адресов."""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4',
+    )
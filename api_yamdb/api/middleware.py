@@ -0,0 +1,172 @@
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from api.metrics import registry
+from api.replicas import is_read_action, pin_to_primary
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+logger = logging.getLogger('api_yamdb.performance')
+
+current_stats = contextvars.ContextVar('current_stats', default=None)
+
+
+class RequestStats:
+    """Показатели одного запроса."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = 'unresolved'
+        self.queries = []
+        self.serialization_time = 0.0
+        self.render_time = 0.0
+
+    @property
+    def db_time(self):
+        return sum(duration for _, duration in self.queries)
+
+
+def record_query(execute, sql, params, many, context):
+    """Обёртка выполнения SQL, учитывающая запросы текущего запроса."""
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries.append((sql, time.perf_counter() - started))
+
+
+@contextmanager
+def timed_serialization():
+    """Учитывает время построения данных ответа сериализатором."""
+    stats = current_stats.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.serialization_time += time.perf_counter() - started
+
+
+class TimedListMixin:
+    """
+    list() DRF с учётом времени serializer.data: данные ответа
+    строятся в представлении, до рендеринга JSON.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(
+            queryset if page is None else page, many=True,
+        )
+        with timed_serialization():
+            data = serializer.data
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class TimedRetrieveMixin:
+    """retrieve() DRF с учётом времени serializer.data."""
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        with timed_serialization():
+            data = serializer.data
+        return Response(data)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def view_label(request, view_func):
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    method = request.method.lower()
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class PerformanceMiddleware(MiddlewareMixin):
+    """
+    Собирает по каждому представлению время ответа, число и время
+    SQL-запросов, время сериализации и рендеринга и размер ответа.
+    Запросы сверх бюджета пишутся в лог вместе с выполненным SQL.
+    """
+
+    def process_request(self, request):
+        request.performance_stats = RequestStats()
+        current_stats.set(request.performance_stats)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.performance_stats.view = view_label(request, view_func)
+
+    def process_template_response(self, request, response):
+        stats = request.performance_stats
+        started = time.perf_counter()
+
+        def rendered(response):
+            stats.render_time += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def process_response(self, request, response):
+        stats = getattr(request, 'performance_stats', None)
+        if stats is None:
+            return response
+        current_stats.set(None)
+        duration = time.perf_counter() - stats.started
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(
+            stats.view, response.status_code, duration, len(stats.queries),
+            stats.db_time, stats.serialization_time, stats.render_time, size,
+        )
+        if (
+            len(stats.queries) > settings.PERFORMANCE_QUERY_BUDGET
+            or duration > settings.PERFORMANCE_LATENCY_BUDGET
+        ):
+            logger.warning(
+                '%s %s (%s): %.3f с, SQL-запросов %d за %.3f с\n%s',
+                request.method, request.get_full_path(), stats.view,
+                duration, len(stats.queries), stats.db_time,
+                '\n'.join(
+                    f'{query_time:.4f} {sql}'
+                    for sql, query_time in stats.queries
+                ),
+            )
+        return response
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+    """
+    После успешного изменяющего запроса закрепляет пользователя за
+    основной базой, чтобы он сразу видел свою запись, а не отставшую реплику.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        actions = getattr(view_func, 'actions', None) or {}
+        request.read_action = is_read_action(
+            getattr(view_func, 'cls', None),
+            actions.get(request.method.lower()),
+        )
+
+    def process_response(self, request, response):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and not getattr(request, 'read_action', False)
+            and response.status_code < 400
+        ):
+            pin_to_primary(request, response)
+        return response
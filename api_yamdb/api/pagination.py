@@ -0,0 +1,157 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """
+    Пагинация limit/offset, а при наличии параметра cursor — по ключу
+    (pub_date, id): страница выбирается по индексу без OFFSET и COUNT(*).
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def use_keyset(self, request):
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.request = request
+        position = self.decode_cursor(request)
+        queryset = self.order_queryset(queryset)
+        if position is not None:
+            queryset = self.filter_after(queryset, position)
+        page = list(queryset[:self.limit + 1])
+        self.has_next = len(page) > self.limit
+        self.page = page[:self.limit]
+        return self.page
+
+    def order_queryset(self, queryset):
+        return queryset.order_by('pub_date', 'id')
+
+    def filter_after(self, queryset, position):
+        pub_date, pk = position
+        return queryset.filter(
+            Q(pub_date__gte=pub_date)
+            & (Q(pub_date__gt=pub_date) | Q(id__gt=pk))
+        )
+
+    def get_position(self, obj):
+        return (obj.pub_date.isoformat(), obj.id)
+
+    def parse_position(self, values):
+        pub_date, pk = values
+        pub_date = parse_datetime(pub_date)
+        if pub_date is None:
+            raise ValueError('pub_date')
+        return (pub_date, int(pk))
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_cursor_link()),
+            ('results', data),
+        ]))
+
+    def get_next_cursor_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(last),
+        )
+
+    def encode_cursor(self, obj):
+        position = '|'.join(str(value) for value in self.get_position(obj))
+        return b64encode(position.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return self.parse_position(
+                b64decode(encoded).decode().split('|')
+            )
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class SearchPagination(KeysetPagination):
+    """Пагинация результатов поиска по ключу (rank, id)."""
+
+    default_limit = 20
+    max_limit = 100
+
+    def use_keyset(self, request):
+        return True
+
+    def order_queryset(self, queryset):
+        return queryset.order_by('-rank', 'id')
+
+    def filter_after(self, queryset, position):
+        rank, pk = position
+        return queryset.filter(Q(rank__lt=rank) | Q(rank=rank, id__gt=pk))
+
+    def get_position(self, obj):
+        return (repr(obj.rank), obj.id)
+
+    def parse_position(self, values):
+        rank, pk = values
+        return (float(rank), int(pk))
+
+
+class ChangesPagination(KeysetPagination):
+    """
+    Лента изменений по возрастанию (txid, id). Курсор since возвращается
+    и на последней странице: с ним клиент опрашивает ленту позже.
+    """
+
+    cursor_query_param = 'since'
+    default_limit = 100
+    max_limit = 1000
+
+    def use_keyset(self, request):
+        return True
+
+    def order_queryset(self, queryset):
+        return queryset.order_by('txid', 'id')
+
+    def filter_after(self, queryset, position):
+        txid, pk = position
+        return queryset.filter(Q(txid__gt=txid) | Q(txid=txid, id__gt=pk))
+
+    def get_position(self, obj):
+        return (obj.txid, obj.id)
+
+    def parse_position(self, values):
+        if len(values) == 1:
+            # Курсор из одного id выдан до txid: у прежних записей он 0.
+            values = ['0', *values]
+        txid, pk = values
+        return (int(txid), int(pk))
+
+    def get_paginated_response(self, data):
+        since = self.request.query_params.get(self.cursor_query_param, '')
+        if self.page:
+            since = self.encode_cursor(self.page[-1])
+        return Response(OrderedDict([
+            ('since', since),
+            ('next', self.get_next_cursor_link()),
+            ('results', data),
+        ]))
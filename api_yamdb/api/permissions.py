@@ -5,7 +5,7 @@ class AuthorAccess(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.pk
         )
 
 
@@ -37,3 +37,15 @@ class AdminOnly(permissions.BasePermission):
     """
     def has_permission(self, request, view):
         return request.user.is_admin or request.user.is_staff
+
+
+class ModeratorOnly(permissions.BasePermission):
+    """
+    Массовая модерация — для модераторов и администраторов.
+    """
+    def has_permission(self, request, view):
+        return (
+            request.user.is_moderator
+            or request.user.is_admin
+            or request.user.is_staff
+        )
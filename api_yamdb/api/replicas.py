@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.db.router import choose_replica, read_replica
+
+PIN_KEY = 'replica-pin:{}'
+# Кука закрепляет за основной базой и клиентов без общего кэша процессов.
+PIN_COOKIE = 'read_primary'
+
+
+def pin_to_primary(request, response):
+    """Следующие REPLICA_PIN_SECONDS чтения автора записи — с основной базы."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(
+            PIN_KEY.format(user.pk), True, settings.REPLICA_PIN_SECONDS,
+        )
+    response.set_cookie(
+        PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+        httponly=True, samesite='Lax',
+    )
+
+
+def is_pinned(request):
+    if request.COOKIES.get(PIN_COOKIE):
+        return True
+    user = request.user
+    return user.is_authenticated and bool(cache.get(PIN_KEY.format(user.pk)))
+
+
+def is_read_action(view_class, action):
+    """Действие только читает данные, хотя вызывается и изменяющим методом."""
+    return action in getattr(view_class, 'read_actions', ())
+
+
+class ReplicaReadMixin:
+    """
+    Безопасные запросы представления и действия из read_actions читают
+    с реплики, если пользователь недавно ничего не записывал
+    (ReadYourWritesMiddleware).
+    """
+
+    read_actions = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        token = read_replica.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            read_replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Пользователь известен после аутентификации в initial().
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in SAFE_METHODS
+            or is_read_action(type(self), self.action)
+        ) and not is_pinned(request):
+            read_replica.set(choose_replica())
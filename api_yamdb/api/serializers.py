@@ -1,9 +1,12 @@
 import datetime as dt
 
+from api.sparse import Relation, SparseFieldsMixin
 from django.core.validators import RegexValidator
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (Category, ChangeLog, Comment, Genre,
+                            LeaderboardEntry, Review, SearchDocument, Title)
+from reviews.moderation import ACTIONS, COMMENT, REVIEW
 from users.models import User
 
 
@@ -90,13 +93,25 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class AuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        fields = ('username', 'first_name', 'last_name',)
+        model = User
+
+
+class TitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(required=False,)
     genre = GenreSerializer(many=True, read_only=True,)
     rating = serializers.FloatField(default=None,)
 
+    sparse_relations = {
+        'category': Relation(CategorySerializer, 'slug'),
+        'genre': Relation(GenreSerializer, 'slug', many=True),
+    }
+    default_expand = ('category', 'genre',)
+
     class Meta:
-        fields = '__all__'
+        exclude = ('reviews_count', 'score_sum',)
         model = Title
 
 
@@ -109,7 +124,7 @@ class TitleAddSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('rating', 'reviews_count', 'score_sum',)
         model = Title
 
     def validate_year(self, value):
@@ -119,18 +134,95 @@ class TitleAddSerializer(serializers.ModelSerializer):
         return value
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = SlugRelatedField(read_only=True, slug_field='username',)
 
+    sparse_relations = {'author': Relation(AuthorSerializer, 'username')}
+    always_load = ('id', 'pub_date',)
+
     class Meta:
         fields = ('id', 'author', 'text', 'pub_date', 'score',)
         model = Review
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     review = serializers.PrimaryKeyRelatedField(read_only=True,)
     author = SlugRelatedField(read_only=True, slug_field='username',)
 
+    sparse_relations = {'author': Relation(AuthorSerializer, 'username')}
+    always_load = ('id', 'pub_date',)
+
     class Meta:
-        fields = '__all__'
+        exclude = ('is_hidden',)
         model = Comment
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    title = TitleSerializer(read_only=True,)
+
+    class Meta:
+        fields = ('weighted_rating', 'reviews_count', 'title',)
+        model = LeaderboardEntry
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source='kind',)
+    id = serializers.IntegerField(source='object_id',)
+    rank = serializers.FloatField()
+
+    class Meta:
+        fields = ('type', 'id', 'title_id', 'review_id', 'text', 'rank',)
+        model = SearchDocument
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    """
+    Запись ленты изменений. data — текущее состояние объекта,
+    None для удалённых.
+    """
+
+    type = serializers.CharField(source='kind',)
+    data = serializers.SerializerMethodField()
+
+    class Meta:
+        fields = (
+            'id', 'type', 'object_id', 'title_id', 'review_id', 'action',
+            'changed_at', 'data',
+        )
+        model = ChangeLog
+
+    def get_data(self, change):
+        return self.context['objects'].get((change.kind, change.object_id))
+
+
+class ModerationSerializer(serializers.Serializer):
+    """
+    Условия массовой модерации: список id, автор и интервал времени
+    публикации [since, until) сочетаются через И.
+    """
+
+    type = serializers.ChoiceField(choices=(REVIEW, COMMENT),)
+    action = serializers.ChoiceField(choices=ACTIONS,)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False,
+        max_length=1000,
+    )
+    author = SlugRelatedField(
+        queryset=User.objects.all(), slug_field='username', required=False,
+    )
+    since = serializers.DateTimeField(required=False,)
+    until = serializers.DateTimeField(required=False,)
+
+    def validate(self, data):
+        if not {'ids', 'author', 'since', 'until'} & set(data):
+            raise serializers.ValidationError(
+                'Укажите ids, author или интервал since/until.'
+            )
+        if (
+            'since' in data and 'until' in data
+            and data['since'] >= data['until']
+        ):
+            raise serializers.ValidationError(
+                'Начало интервала должно быть раньше конца.'
+            )
+        return data
@@ -0,0 +1,45 @@
+from api.cache import bump_version
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Comment, Review, Title
+from reviews.signals import titles_updated
+
+
+def bump_title(title_id):
+    transaction.on_commit(lambda: bump_version(f'title:{title_id}'))
+
+
+def bump_titles():
+    transaction.on_commit(lambda: bump_version('titles'))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def bump_title_version(sender, instance, **kwargs):
+    """Версия произведения — валидатор ответов с его отзывами."""
+    bump_title(instance.pk)
+    bump_titles()
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_review_title_version(sender, instance, **kwargs):
+    bump_title(instance.title_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_title_version(sender, instance, **kwargs):
+    bump_title(instance.review.title_id)
+
+
+@receiver(titles_updated)
+def bump_updated_titles_version(sender, title_ids, **kwargs):
+    """
+    Рейтинг, счётчики отзывов и жанры входят в список и карточки
+    произведений, в т.ч. после каскадного удаления отзывов и импорта.
+    """
+    for title_id in title_ids or ():
+        bump_title(title_id)
+    bump_titles()
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import SlugRelatedField
+
+
+def split_param(request, name):
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [item for item in value.split(',') if item]
+
+
+class Relation:
+    """
+    Связь, которую ?expand= выводит вложенным сериализатором,
+    а без раскрытия — значением slug_field.
+    """
+
+    def __init__(self, serializer_class, slug_field, many=False):
+        self.serializer_class = serializer_class
+        self.slug_field = slug_field
+        self.many = many
+
+    def get_field(self, expanded):
+        if expanded:
+            return self.serializer_class(many=self.many, read_only=True)
+        return SlugRelatedField(
+            many=self.many, read_only=True, slug_field=self.slug_field,
+        )
+
+    def load_fields(self, expanded):
+        if expanded:
+            return self.serializer_class.Meta.fields
+        return (self.slug_field,)
+
+
+class SparseFieldsMixin:
+    """
+    Поля ответа по ?fields=id,name и раскрытие связей по ?expand=.
+    narrow_queryset() сужает выборку до запрошенного: only(),
+    select_related и prefetch_related только для выводимых связей.
+    """
+
+    sparse_relations = {}
+    default_expand = ()
+    # Поля, которые нужны пагинации и представлениям независимо от вывода.
+    always_load = ('id',)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        self.sparse = False
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+        requested = split_param(request, 'fields')
+        expand = split_param(request, 'expand')
+        self.sparse = requested is not None or expand is not None
+        if requested is not None:
+            unknown = set(requested) - set(fields)
+            if unknown:
+                raise ValidationError({
+                    'fields': f'Неизвестные поля: {", ".join(sorted(unknown))}'
+                })
+            fields = OrderedDict(
+                (name, field) for name, field in fields.items()
+                if name in requested
+            )
+        if expand is None:
+            expand = self.default_expand
+        unknown = set(expand) - set(self.sparse_relations)
+        if unknown:
+            raise ValidationError({
+                'expand': f'Нельзя раскрыть: {", ".join(sorted(unknown))}'
+            })
+        self.expanded = set(expand)
+        for name, relation in self.sparse_relations.items():
+            if name in fields:
+                fields[name] = relation.get_field(name in self.expanded)
+        return fields
+
+    def narrow_queryset(self, queryset):
+        fields = self.fields
+        if not self.sparse:
+            return queryset
+        model = self.Meta.model
+        queryset = queryset.select_related(None).prefetch_related(None)
+        only = set(self.always_load)
+        for name, field in fields.items():
+            relation = self.sparse_relations.get(name)
+            if relation is None:
+                if field.source != '*':
+                    only.add(field.source)
+                continue
+            load = relation.load_fields(name in self.expanded)
+            if relation.many:
+                related_model = model._meta.get_field(name).related_model
+                queryset = queryset.prefetch_related(Prefetch(
+                    name,
+                    queryset=related_model.objects.only(*load).order_by('pk'),
+                ))
+            else:
+                queryset = queryset.select_related(name)
+                only.update(f'{name}__{related}' for related in load)
+        return queryset.only(*only)
+
+
+class SparseQuerysetMixin:
+    """Сужает выборку представления под ?fields= и ?expand=."""
+
+    def narrow_queryset(self, queryset):
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsMixin):
+            return queryset
+        return serializer.narrow_queryset(queryset)
@@ -0,0 +1,83 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+from users.models import User
+
+ANON = 'anon'
+BUCKET_KEY = 'throttle:{}:{}'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60): ёмкость корзины и время её полного наполнения."""
+    capacity, period = rate.split('/')
+    return int(capacity), PERIODS[period[0]]
+
+
+def get_role(user):
+    if not user or not user.is_authenticated:
+        return ANON
+    return getattr(user, 'role', User.USER)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket в кэше THROTTLE_CACHE_ALIAS. Корзина меняется только
+    атомарными add и incr, поэтому лимит общий для всех процессов, если
+    кэш общий (memcached, redis). Лимиты берутся из THROTTLE_RATES по
+    throttle_scope представления и роли пользователя; корзина — у
+    пользователя, у анонима — у IP-адреса.
+    """
+
+    def get_bucket_key(self, request, view):
+        user = request.user
+        ident = (
+            f'user:{user.pk}' if user and user.is_authenticated
+            else f'ip:{self.get_ident(request)}'
+        )
+        return BUCKET_KEY.format(view.throttle_scope, ident)
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        rates = settings.THROTTLE_RATES.get(
+            getattr(view, 'throttle_scope', None), {},
+        )
+        rate = rates.get(get_role(request.user))
+        if rate is None:
+            return True
+        capacity, period = parse_rate(rate)
+        # Время наполнения корзины и получения одного токена, мс.
+        full = period * 1000
+        interval = full // capacity
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        key = self.get_bucket_key(request, view)
+        now = int(time.time() * 1000)
+        # Корзина хранится одним числом — моментом, когда в ней было
+        # 0 токенов; сейчас в ней (now - empty_at) / interval токенов,
+        # но не больше capacity. incr сразу списывает токен.
+        try:
+            empty_at = cache.incr(key, interval)
+        except ValueError:
+            # Ключа нет — корзина полна. add создаст ключ только в одном
+            # из одновременных запросов, остальные спишут токен через incr.
+            empty_at = now - full + interval
+            if not cache.add(key, empty_at, period):
+                empty_at = cache.incr(key, interval)
+        if empty_at - interval < now - full:
+            # Корзина наполнилась раньше, чем истёк ключ: лишнее не копим.
+            empty_at = cache.incr(key, now - full - (empty_at - interval))
+        if empty_at > now:
+            # Токена не было: возвращаем списанное.
+            cache.decr(key, interval)
+            self.wait_time = (empty_at - now) / 1000
+            return False
+        # Полная корзина не отличается от пустого ключа: хранить её дольше
+        # незачем.
+        cache.touch(key, math.ceil((empty_at + full - now) / 1000))
+        return True
+
+    def wait(self):
+        return self.wait_time
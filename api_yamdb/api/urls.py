@@ -1,5 +1,7 @@
-from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                       ReviewViewSet, SendToken, SignUp, TitleViewSet,
+from api.async_views import async_reads
+from api.views import (CategoryViewSet, ChangesView, CommentViewSet,
+                       ExportView, GenreViewSet, ModerationView, ReviewViewSet,
+                       SearchView, SendToken, SignUp, TitleViewSet,
                        UserMeViewSet)
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
@@ -22,7 +24,11 @@ v1_router.register(
 
 urlpatterns = [
     path('v1/', include([
-        path('', include(v1_router.urls)),
+        path('', include(async_reads(v1_router.urls))),
+        path('search/', SearchView.as_view(), name='search',),
+        path('export/', ExportView.as_view(), name='export',),
+        path('changes/', ChangesView.as_view(), name='changes',),
+        path('moderation/', ModerationView.as_view(), name='moderation',),
         path('auth/', include([
             path('signup/', SignUp.as_view(), name='signup',),
             path('token/', SendToken.as_view(), name='login',),
@@ -1,14 +1,29 @@
 import django_filters
+from api.async_views import sync_iterator
+from api.cache import CachedListMixin, CachedRetrieveMixin, bump_version
+from api.conditional import ConditionalGetMixin
+from api.fast import CompiledSerializer, FastListMixin
+from api.middleware import (TimedListMixin, TimedRetrieveMixin,
+                            timed_serialization)
+from api.pagination import (ChangesPagination, KeysetPagination,
+                            SearchPagination)
 from api.permissions import (AdminAccess, AdminOnly, AuthorAccess,
-                             ModeratorAccess)
-from api.serializers import (CategorySerializer, CommentSerializer,
-                             GenreSerializer, ReviewSerializer,
+                             ModeratorAccess, ModeratorOnly)
+from api.replicas import ReplicaReadMixin
+from api.serializers import (CategorySerializer, ChangeSerializer,
+                             CommentSerializer, GenreSerializer,
+                             LeaderboardEntrySerializer, ModerationSerializer,
+                             ReviewSerializer, SearchResultSerializer,
                              SendTokenSerializer, SingUpSerializer,
                              TitleAddSerializer, TitleSerializer,
                              UserNotAdminSerializer, UserSerializer)
+from api.sparse import SparseQuerysetMixin, split_param
+from api.throttling import TokenBucketThrottle
+from django.conf import settings
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import send_mail
-from django.db.models import Avg, Q
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action
@@ -17,21 +32,26 @@ from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title
-from users.models import User
+from reviews.export import export
+from reviews.leaderboard import ALL, category_board, genre_board, top
+from reviews.models import (Category, ChangeLog, Comment, Genre, Review,
+                            SearchDocument, Title)
+from reviews.moderation import NOT_FOUND, TooManyObjectsError, moderate, select
+from reviews.search import SearchTimeoutError, search, search_timeout
+from users.models import OutboxMessage, User
+from users.tokens import access_token_for
 
 from api_yamdb.settings import EMAIL_HOST_USER
 
 
 def singup_mail(target_email, user):
+    """Ставит письмо с кодом подтверждения в очередь на отправку."""
     confirmation_code = PasswordResetTokenGenerator().make_token(user)
-    return send_mail(
-        'Добро пожаловать!',
-        f'Ваш код подтверждения: {confirmation_code,}',
-        EMAIL_HOST_USER,
-        [target_email],
-        fail_silently=True,
+    return OutboxMessage.objects.create(
+        subject='Добро пожаловать!',
+        body=f'Ваш код подтверждения: {confirmation_code,}',
+        from_email=EMAIL_HOST_USER,
+        recipient=target_email,
     )
 
 
@@ -40,6 +60,8 @@ class SignUp(APIView):
 
     permission_classes = [permissions.AllowAny]
     pagination_class = LimitOffsetPagination
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'signup'
 
     def post(self, request):
         serializer = SingUpSerializer(data=request.data)
@@ -70,6 +92,8 @@ class SendToken(APIView):
 
     permission_classes = [permissions.AllowAny]
     pagination_class = LimitOffsetPagination
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'token'
 
     def post(self, request):
         serializer = SendTokenSerializer(data=request.data)
@@ -84,13 +108,15 @@ class SendToken(APIView):
                 'Неверный код подтверждения',
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        token = RefreshToken.for_user(user).access_token
         user.is_active = True
         user.save()
+        token = access_token_for(user)
         return Response(f'token: {str(token)}', status=status.HTTP_200_OK)
 
 
-class UserMeViewSet(viewsets.ModelViewSet):
+class UserMeViewSet(
+    TimedListMixin, TimedRetrieveMixin, viewsets.ModelViewSet,
+):
     """Класс для работы с эндпоинтами users."""
 
     serializer_class = UserSerializer
@@ -110,17 +136,19 @@ class UserMeViewSet(viewsets.ModelViewSet):
         url_path='me'
     )
     def get_response_me(self, request):
-        serializer = UserSerializer(request.user)
+        # Пользователь из токена не связан с базой, загружаем модель.
+        user = get_object_or_404(User, pk=request.user.pk)
+        serializer = UserSerializer(user)
         if request.method == 'PATCH':
-            if request.user.is_admin:
+            if user.is_admin:
                 serializer = UserSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True
                 )
             else:
                 serializer = UserNotAdminSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True
                 )
@@ -140,6 +168,8 @@ class TitleFilter(django_filters.FilterSet):
 
 
 class CategoryViewSet(
+    CachedListMixin,
+    TimedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -151,9 +181,13 @@ class CategoryViewSet(
     filter_backends = (filters.SearchFilter,)
     search_fields = ['name', ]
     lookup_field = 'slug'
+    cache_resource = 'categories'
+    cache_invalidates = ('categories', 'titles',)
 
 
 class GenreViewSet(
+    CachedListMixin,
+    TimedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -165,64 +199,382 @@ class GenreViewSet(
     filter_backends = (filters.SearchFilter,)
     search_fields = ['name', ]
     lookup_field = 'slug'
-
-
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'),)
+    cache_resource = 'genres'
+    cache_invalidates = ('genres', 'titles',)
+
+
+class TitleViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseQuerysetMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    FastListMixin,
+    TimedListMixin,
+    TimedRetrieveMixin,
+    viewsets.ModelViewSet,
+):
+    # Порядок жанров задан явно: его повторяет быстрый вывод списка.
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('pk')),
+    ).order_by('pk')
     serializer_class = TitleSerializer
     permission_classes = [IsAuthenticatedOrReadOnly & AdminAccess]
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cache_resource = 'titles'
+    cache_invalidates = ('titles',)
+    # POST /titles/batch/ только читает и может идти на реплику.
+    read_actions = ('batch',)
+    batch_max_size = 200
+
+    def get_queryset(self):
+        return self.narrow_queryset(super().get_queryset())
+
+    def get_validators(self, request):
+        return self.resource_validators(request, self.cache_resource)
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update', ]:
             return TitleAddSerializer
         return self.serializer_class
 
+    @action(detail=False, methods=['GET'], url_path='facets')
+    def facets(self, request):
+        """Количество произведений по жанрам, категориям и годам."""
+        return self.get_cached_response(self.get_facets, request)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_facets(self, request):
+        year_bucket = request.query_params.get('year_bucket', '10')
+        if not year_bucket.isdigit() or not 1 <= int(year_bucket) <= 100:
+            raise ValidationError(
+                {'year_bucket': 'Укажите число лет от 1 до 100.'}
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(queryset.facets(int(year_bucket)))
+
+    @action(
+        detail=False,
+        methods=['GET', 'POST'],
+        permission_classes=[permissions.AllowAny],
+        url_path='batch',
+    )
+    def batch(self, request):
+        """
+        Произведения по списку id в порядке запроса: ?ids=1,2,3 или
+        {"ids": [...]} в POST для длинных списков. Не найденные id
+        перечисляются в missing.
+        """
+        ids = self.get_batch_ids(request)
+        queryset = self.get_queryset().filter(pk__in=ids)
+        if self.fast_list:
+            compiled = CompiledSerializer(self.get_serializer())
+            rows = list(compiled.values(queryset))
+            with timed_serialization():
+                found = dict(zip(
+                    (row['pk'] for row in rows), compiled.serialize(rows),
+                ))
+        else:
+            titles = list(queryset)
+            with timed_serialization():
+                found = {
+                    title.pk: self.get_serializer(title).data
+                    for title in titles
+                }
+        return Response({
+            'results': [found[pk] for pk in ids if pk in found],
+            'missing': [pk for pk in ids if pk not in found],
+        })
+
+    def get_batch_ids(self, request):
+        if request.method == 'POST':
+            ids = request.data.get('ids')
+        else:
+            ids = split_param(request, 'ids')
+        if isinstance(ids, str):
+            ids = [pk for pk in ids.split(',') if pk]
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({'ids': 'Передайте список id произведений.'})
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            raise ValidationError({'ids': 'id произведений — целые числа.'})
+        if len(ids) > self.batch_max_size:
+            raise ValidationError({
+                'ids': f'Не больше {self.batch_max_size} id за запрос.'
+            })
+        # Повторы выводятся один раз, на месте первого упоминания.
+        return list(dict.fromkeys(ids))
+
+    @action(detail=False, methods=['GET'], url_path='top')
+    def top(self, request):
+        """
+        Лучшие произведения по взвешенному рейтингу: общий список
+        или ?category=, ?genre= по slug.
+        """
+        limit = request.query_params.get('limit', '10')
+        if not limit.isdigit() or not 1 <= int(limit) <= 100:
+            raise ValidationError({'limit': 'Укажите число от 1 до 100.'})
+        board = ALL
+        category = request.query_params.get('category')
+        genre = request.query_params.get('genre')
+        if category is not None:
+            board = category_board(
+                get_object_or_404(Category, slug=category).pk
+            )
+        elif genre is not None:
+            board = genre_board(get_object_or_404(Genre, slug=genre).pk)
+        entries = list(top(board, int(limit)).select_related(
+            'title__category',
+        ).prefetch_related(
+            Prefetch('title__genre', queryset=Genre.objects.order_by('pk')),
+        ))
+        with timed_serialization():
+            data = LeaderboardEntrySerializer(entries, many=True).data
+        return Response(data)
+
+
+class ReviewViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseQuerysetMixin,
+    TimedListMixin,
+    TimedRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = ReviewSerializer
     permission_classes = [
         IsAuthenticatedOrReadOnly & (
             AuthorAccess | ModeratorAccess | AdminAccess
         )
     ]
+    pagination_class = KeysetPagination
+
+    def get_title(self):
+        """Произведение из URL, загружается один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id'),
+            )
+        return self._title
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'),)
-        return title.reviews.all()
+        queryset = self.get_title().reviews.visible().select_related('author')
+        if self.action in ('update', 'partial_update', 'destroy'):
+            # Прежняя оценка читается под блокировкой строки: иначе две
+            # одновременные правки или удаления снимут с рейтинга одну и ту
+            # же оценку.
+            queryset = queryset.select_for_update(of=('self',))
+        return self.narrow_queryset(queryset)
+
+    def get_validators(self, request):
+        title = self.get_title()
+        return self.resource_validators(
+            request, f'title:{title.pk}',
+            title.reviews.visible() if self.action == 'list' else None,
+        )
+
+    def update(self, request, *args, **kwargs):
+        # Блокировка из get_object() держится до сохранения отзыва.
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        # Второе удаление дождётся блокировки и получит 404.
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'),)
-        if Review.objects.filter(
-            author=self.request.user, title_id=title.id
-        ).exists():
+        # Повторный отзыв отсекает unique_together на (author, title).
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    author_id=self.request.user.pk, title=self.get_title(),
+                )
+        except IntegrityError:
             raise ValidationError(
                 'Вы уже оставили отзыв на данное произведение.'
             )
-        serializer.save(author=self.request.user, title_id=title.id)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseQuerysetMixin,
+    TimedListMixin,
+    TimedRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = CommentSerializer
     permission_classes = [
         IsAuthenticatedOrReadOnly & (
             AuthorAccess | ModeratorAccess | AdminAccess
         )
     ]
+    pagination_class = KeysetPagination
+
+    def get_review(self):
+        """Отзыв из URL, загружается один раз за запрос."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.visible(),
+                id=self.kwargs.get('review_id'),
+                title__id=self.kwargs.get('title_id'),
+            )
+        return self._review
 
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id'),
+        return self.narrow_queryset(
+            self.get_review().comments.filter(
+                is_hidden=False,
+            ).select_related('author')
+        )
+
+    def get_validators(self, request):
+        review = self.get_review()
+        return self.resource_validators(
+            request, f'title:{review.title_id}',
+            review.comments.filter(is_hidden=False)
+            if self.action == 'list' else None,
         )
-        return review.comments.all()
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id'),
+        serializer.save(
+            author_id=self.request.user.pk, review=self.get_review(),
         )
-        serializer.save(author=self.request.user, review_id=review.id)
+
+
+class SearchView(APIView):
+    """Полнотекстовый поиск по произведениям, отзывам и комментариям."""
+
+    permission_classes = [permissions.AllowAny]
+    pagination_class = SearchPagination
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'Укажите поисковый запрос.'})
+        paginator = self.pagination_class()
+        try:
+            with search_timeout():
+                page = paginator.paginate_queryset(
+                    search(query), request, self,
+                )
+        except SearchTimeoutError:
+            return Response(
+                'Поиск занял слишком много времени, уточните запрос',
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        with timed_serialization():
+            data = SearchResultSerializer(page, many=True).data
+        return paginator.get_paginated_response(data)
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка каталога для партнёров."""
+
+    permission_classes = (permissions.IsAuthenticated, AdminOnly)
+    content_types = {
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+        'csv': 'text/csv; charset=utf-8',
+    }
+
+    def get(self, request):
+        output_format = request.query_params.get('output', 'ndjson')
+        kinds = request.query_params.get('kind', 'titles').split(',')
+        try:
+            content = export(output_format, kinds)
+        except ValueError as error:
+            raise ValidationError(str(error))
+        response = StreamingHttpResponse(
+            sync_iterator(content),
+            content_type=self.content_types[output_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="catalog.{output_format}"'
+        )
+        return response
+
+
+class ChangesView(APIView):
+    """Лента созданных, изменённых и удалённых объектов в порядке фиксации."""
+
+    permission_classes = [permissions.AllowAny]
+    pagination_class = ChangesPagination
+    sources = {
+        SearchDocument.TITLE: (
+            Title.objects.select_related('category').prefetch_related(
+                'genre',
+            ),
+            TitleSerializer,
+        ),
+        SearchDocument.REVIEW: (
+            Review.objects.visible().select_related('author'),
+            ReviewSerializer,
+        ),
+        SearchDocument.COMMENT: (
+            Comment.objects.visible().select_related('author'),
+            CommentSerializer,
+        ),
+    }
+
+    def get(self, request):
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(
+            ChangeLog.objects.committed(), request, self,
+        )
+        objects = {}
+        for kind, (queryset, serializer_class) in self.sources.items():
+            ids = {
+                change.object_id for change in page
+                if change.kind == kind and change.action != ChangeLog.DELETED
+            }
+            if ids:
+                found = list(queryset.filter(pk__in=ids))
+                with timed_serialization():
+                    for obj in found:
+                        objects[(kind, obj.pk)] = serializer_class(obj).data
+        with timed_serialization():
+            data = ChangeSerializer(
+                page, many=True, context={'objects': objects},
+            ).data
+        return paginator.get_paginated_response(data)
+
+
+class ModerationView(APIView):
+    """
+    Массовое удаление, скрытие и возврат отзывов или комментариев
+    набором запросов вместо DELETE на каждый объект. В ответе — статус
+    каждого id: deleted, hidden, shown, unchanged или not_found.
+    """
+
+    permission_classes = (permissions.IsAuthenticated, ModeratorOnly)
+
+    def post(self, request):
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        kind = data.pop('type')
+        action = data.pop('action')
+        limit = settings.MODERATION_MAX_OBJECTS
+        try:
+            statuses, title_ids = moderate(
+                kind, action, select(kind, **data), limit,
+            )
+        except TooManyObjectsError:
+            raise ValidationError(
+                f'Условиям соответствует больше {limit} объектов, '
+                'сузьте выборку.'
+            )
+        transaction.on_commit(lambda: bump_version(
+            'titles', *(f'title:{title_id}' for title_id in title_ids),
+        ))
+        ids = data.get('ids') or list(statuses)
+        return Response({
+            'type': kind,
+            'action': action,
+            'results': [
+                {'id': pk, 'status': statuses.get(pk, NOT_FOUND)}
+                for pk in dict.fromkeys(ids)
+            ],
+        })
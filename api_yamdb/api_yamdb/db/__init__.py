@@ -0,0 +1,17 @@
+from django.db import connections
+
+
+def close_unusable_connections(**kwargs):
+    """
+    Проверка постоянных соединений перед запросом (CONN_HEALTH_CHECKS
+    появится в Django 4.1): соединение, разорванное сервером или
+    балансировщиком, закрывается и будет открыто заново.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+
+
+class PoolTimeoutError(Exception):
+    """Свободное соединение не появилось за отведённое время."""
+
+
+class ConnectionPool:
+    """
+    Пул соединений процесса. Потокобезопасен, поэтому общий для потоков
+    WSGI-воркера и для потоков sync_to_async под ASGI.
+    """
+
+    def __init__(self, max_size, timeout, health_checks=True):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_checks = health_checks
+        self.idle = []
+        self.in_use = 0
+        self.condition = threading.Condition()
+        self.created = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    @property
+    def size(self):
+        return self.in_use + len(self.idle)
+
+    def acquire(self, connect):
+        started = time.monotonic()
+        with self.condition:
+            waited = False
+            while not self.idle and self.size >= self.max_size:
+                waited = True
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeoutError(
+                        f'Нет свободных соединений за {self.timeout} с'
+                    )
+                self.condition.wait(remaining)
+            if waited:
+                self.waits += 1
+                self.wait_time += time.monotonic() - started
+            self.in_use += 1
+            connection = self.idle.pop() if self.idle else None
+        if connection is not None and self.is_usable(connection):
+            return connection
+        if connection is not None:
+            self.discard(connection)
+        try:
+            connection = connect()
+        except Exception:
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created += 1
+        return connection
+
+    def release(self, connection):
+        """Возвращает соединение в пул, откатив незавершённую транзакцию."""
+        try:
+            if not connection.closed:
+                connection.rollback()
+        except Exception:
+            pass
+        with self.condition:
+            self.in_use -= 1
+            if not connection.closed:
+                self.idle.append(connection)
+            self.condition.notify()
+
+    def is_usable(self, connection):
+        if connection.closed:
+            return False
+        if not self.health_checks:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Exception:
+            return False
+        return True
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            self.discard(connection)
+
+    def stats(self):
+        with self.condition:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'in_use': self.in_use,
+                'idle': len(self.idle),
+                'created': self.created,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'timeouts': self.timeouts,
+            }
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    """
+    Пул для псевдонима базы. Создаётся лениво в каждом процессе, чтобы
+    воркеры gunicorn не делили соединения, открытые до fork.
+    """
+    key = (os.getpid(), alias)
+    with pools_lock:
+        if key not in pools:
+            options = settings_dict.get('POOL', {})
+            pools[key] = ConnectionPool(
+                options.get('MAX_SIZE', 10),
+                options.get('TIMEOUT', 5),
+                settings_dict.get('CONN_HEALTH_CHECKS', True),
+            )
+        return pools[key]
+
+
+def pool_stats():
+    pid = os.getpid()
+    with pools_lock:
+        current = {
+            alias: pool for (owner, alias), pool in pools.items()
+            if owner == pid
+        }
+    return {alias: pool.stats() for alias, pool in sorted(current.items())}
@@ -0,0 +1,29 @@
+from django.db.backends.postgresql import base
+
+from api_yamdb.db.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Postgres с пулом соединений процесса: close() возвращает соединение
+    в пул, а новое соединение берётся из пула, если там есть свободное.
+    """
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, self.settings_dict)
+        connection = pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params,
+            )
+        )
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level,
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                get_pool(self.alias, self.settings_dict).release(
+                    self.connection,
+                )
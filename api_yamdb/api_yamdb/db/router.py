@@ -0,0 +1,46 @@
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+
+DEFAULT_DB = 'default'
+
+# Реплика, с которой читает текущий запрос; None — основная база.
+read_replica = contextvars.ContextVar('read_replica', default=None)
+
+
+def choose_replica():
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+@contextmanager
+def use_replica(alias=None):
+    """Направляет чтения внутри блока на реплику (по умолчанию — случайную)."""
+    token = read_replica.set(alias or choose_replica())
+    try:
+        yield read_replica.get()
+    finally:
+        read_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Чтения идут на реплику, выбранную для запроса через use_replica(),
+    все записи — на основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_replica.get() or DEFAULT_DB
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии основной базы: связи между ними допустимы.
+        databases = {DEFAULT_DB, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -40,6 +40,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.PerformanceMiddleware',
+    'api.middleware.ReadYourWritesMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,10 +82,58 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', 'postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'postgres'),
         'HOST': os.getenv('DB_HOST', 'db'),
-        'PORT': os.getenv('DB_PORT', '5432')
+        'PORT': os.getenv('DB_PORT', '5432'),
+        # Постоянные соединения; 0 — закрывать после каждого запроса.
+        # С пулом (DB_ENGINE=api_yamdb.db.postgresql) ставьте 0: закрытое
+        # соединение возвращается в пул.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.getenv(
+            'DB_CONN_HEALTH_CHECKS', 'true'
+        ).lower() == 'true',
+        'POOL': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+        },
+    }
+}
+
+# Read replicas
+
+# Хосты реплик через запятую, остальные параметры — как у основной базы.
+for index, host in enumerate(
+    host for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host
+):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['api_yamdb.db.router.ReplicaRouter']
+# Сколько секунд после записи пользователь читает с основной базы.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+# Async reads
+
+# Чтения каталога под ASGI выполняются в пуле потоков (ASGI_THREADS).
+ASYNC_READ_THREAD_POOL = os.getenv(
+    'ASYNC_READ_THREAD_POOL', 'true'
+).lower() == 'true'
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -138,6 +188,10 @@ EMAIL_USE_SSL = True
 SERVER_EMAIL = EMAIL_HOST_USER
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 100))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 5))
+OUTBOX_RETRY_DELAY = int(os.getenv('OUTBOX_RETRY_DELAY', 30))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
@@ -145,13 +199,47 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 100,
+    # Адрес клиента берётся из X-Forwarded-For, который выставляет nginx.
+    'NUM_PROXIES': 1,
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+
+# Лимиты запросов 'ёмкость/период' по throttle_scope представления и роли
+# (anon и User.ROLES); None — без ограничения.
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_RATES = {
+    'signup': {
+        'anon': os.getenv('THROTTLE_SIGNUP_RATE', '5/min'),
+        'user': '5/min',
+        'moderator': '20/min',
+        'admin': None,
+    },
+    'token': {
+        'anon': os.getenv('THROTTLE_TOKEN_RATE', '10/min'),
+        'user': '10/min',
+        'moderator': '30/min',
+        'admin': None,
+    },
+}
+
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1').split(',')
+PERFORMANCE_QUERY_BUDGET = int(os.getenv('PERFORMANCE_QUERY_BUDGET', 20))
+PERFORMANCE_LATENCY_BUDGET = float(os.getenv('PERFORMANCE_LATENCY_BUDGET', 0.5))
+
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'russian')
+SEARCH_TIMEOUT_MS = int(os.getenv('SEARCH_TIMEOUT_MS', 2000))
+
+MODERATION_MAX_OBJECTS = int(os.getenv('MODERATION_MAX_OBJECTS', 5000))
+
+LEADERBOARD_MIN_REVIEWS = int(os.getenv('LEADERBOARD_MIN_REVIEWS', 5))
+LEADERBOARD_MEAN_TIMEOUT = int(os.getenv('LEADERBOARD_MEAN_TIMEOUT', 3600))
+
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.getenv('TOKEN_VERSION_CACHE_TIMEOUT', 60))
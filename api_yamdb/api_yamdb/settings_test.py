@@ -0,0 +1,17 @@
+"""Настройки для запуска тестов без внешнего Postgres."""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+DATABASE_REPLICAS = []
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# База в памяти видна только соединению основного потока.
+ASYNC_READ_THREAD_POOL = False
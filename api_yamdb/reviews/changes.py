@@ -0,0 +1,40 @@
+from django.db import connection, transaction
+from reviews.models import ChangeLog, SearchDocument
+from reviews.search import KINDS
+
+
+def parent_ids(kind, instance):
+    if kind == SearchDocument.TITLE:
+        return instance.pk, None
+    if kind == SearchDocument.REVIEW:
+        return instance.title_id, instance.pk
+    return instance.review.title_id, instance.review_id
+
+
+def log_change(instance, action):
+    """Записывает изменение объекта в журнал."""
+    kind = KINDS[type(instance)]
+    title_id, review_id = parent_ids(kind, instance)
+    log_changes(kind, [(instance.pk, title_id, review_id)], action)
+
+
+def log_changes(kind, rows, action):
+    """
+    Записывает изменения одной пачкой; rows — кортежи (id объекта,
+    id произведения, id отзыва). На Postgres запись помечается txid
+    своей транзакции: по нему лента не пропустит записи транзакций,
+    зафиксированных позже, без общей блокировки на все записи сайта.
+    """
+    with transaction.atomic():
+        txid = 0
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT txid_current()')
+                txid = cursor.fetchone()[0]
+        ChangeLog.objects.bulk_create([
+            ChangeLog(
+                kind=kind, object_id=object_id, title_id=title_id,
+                review_id=review_id, action=action, txid=txid,
+            )
+            for object_id, title_id, review_id in rows
+        ])
@@ -0,0 +1,127 @@
+import csv
+import json
+from collections import defaultdict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from reviews.models import Comment, GenreTitle, Review, Title
+
+FORMATS = ('ndjson', 'csv')
+# Столбцы выгрузки каждого вида записей: (столбец, поле values()).
+COLUMNS = {
+    'titles': (
+        ('id', 'id'), ('name', 'name'), ('year', 'year'),
+        ('description', 'description'), ('category', 'category__slug'),
+        ('genre', None), ('rating', 'rating'),
+    ),
+    'reviews': (
+        ('id', 'id'), ('title_id', 'title_id'),
+        ('author', 'author__username'), ('text', 'text'),
+        ('score', 'score'), ('pub_date', 'pub_date'),
+    ),
+    'comments': (
+        ('id', 'id'), ('review_id', 'review_id'),
+        ('author', 'author__username'), ('text', 'text'),
+        ('pub_date', 'pub_date'),
+    ),
+}
+QUERYSETS = {
+    'titles': Title.objects.all,
+    'reviews': Review.objects.visible,
+    'comments': Comment.objects.visible,
+}
+BUFFER_SIZE = 64 * 1024
+
+
+def chunked(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_records(kind, chunk_size=2000):
+    """
+    Записи одного вида в порядке id. iterator() читает выборку
+    серверным курсором, жанры подгружаются одним запросом на пачку.
+    """
+    columns = COLUMNS[kind]
+    fields = [field for _, field in columns if field]
+    rows = QUERYSETS[kind]().order_by('pk').values_list(*fields).iterator(
+        chunk_size=chunk_size,
+    )
+    for chunk in chunked(rows, chunk_size):
+        genres = defaultdict(list)
+        if kind == 'titles':
+            for title_id, slug in GenreTitle.objects.filter(
+                title_id__in=[row[0] for row in chunk],
+                genre__isnull=False,
+            ).order_by('genre__slug').values_list('title_id', 'genre__slug'):
+                genres[title_id].append(slug)
+        for row in chunk:
+            values = iter(row)
+            yield {
+                name: next(values) if field else genres[row[0]]
+                for name, field in columns
+            }
+
+
+def buffered(lines):
+    """Склеивает строки в куски около BUFFER_SIZE для отправки клиенту."""
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= BUFFER_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def ndjson_lines(kinds, chunk_size):
+    for kind in kinds:
+        for record in iter_records(kind, chunk_size):
+            yield json.dumps(
+                {'type': kind[:-1], **record},
+                cls=DjangoJSONEncoder, ensure_ascii=False,
+            ) + '\n'
+
+
+class Echo:
+    """Псевдофайл: csv.writer возвращает записанную строку как есть."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(kind, chunk_size):
+    writer = csv.writer(Echo())
+    yield writer.writerow(name for name, _ in COLUMNS[kind])
+    for record in iter_records(kind, chunk_size):
+        yield writer.writerow(
+            ','.join(value) if isinstance(value, list) else value
+            for value in record.values()
+        )
+
+
+def export(output_format, kinds, chunk_size=2000):
+    """
+    Генератор выгрузки каталога. NDJSON содержит записи всех видов
+    из kinds с полем type, CSV — записи одного вида.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f'Неизвестный формат: {output_format}')
+    unknown = set(kinds) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f'Неизвестные виды записей: {", ".join(unknown)}')
+    if output_format == 'csv':
+        if len(kinds) != 1:
+            raise ValueError('CSV выгружает записи только одного вида')
+        return buffered(csv_lines(kinds[0], chunk_size))
+    return buffered(ndjson_lines(kinds, chunk_size))
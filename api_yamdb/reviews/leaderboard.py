@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from reviews.models import GenreTitle, LeaderboardEntry, Title
+
+ALL = 'all'
+MEAN_KEY = 'leaderboard:mean'
+TITLE_FIELDS = ('id', 'category_id', 'reviews_count', 'score_sum')
+
+
+def category_board(category_id):
+    return f'category:{category_id}'
+
+
+def genre_board(genre_id):
+    return f'genre:{genre_id}'
+
+
+def global_mean():
+    """Средняя оценка C по всем отзывам, кэшируется."""
+    mean = cache.get(MEAN_KEY)
+    if mean is None:
+        totals = Title.objects.aggregate(
+            scores=Sum('score_sum'), count=Sum('reviews_count'),
+        )
+        mean = totals['scores'] / totals['count'] if totals['count'] else 0.0
+        cache.set(MEAN_KEY, mean, settings.LEADERBOARD_MEAN_TIMEOUT)
+    return mean
+
+
+def weighted_rating(score_sum, reviews_count, mean, min_reviews):
+    """
+    Байесовская оценка (v·R + m·C) / (v + m) = (S + m·C) / (v + m):
+    пока отзывов мало, рейтинг тянется к средней оценке C.
+    """
+    return (score_sum + min_reviews * mean) / (reviews_count + min_reviews)
+
+
+def make_entries(titles):
+    """Строки всех рейтингов для произведений, у которых есть отзывы."""
+    titles = [title for title in titles if title['reviews_count']]
+    genres = {}
+    for title_id, genre_id in GenreTitle.objects.filter(
+        title_id__in=[title['id'] for title in titles], genre__isnull=False,
+    ).values_list('title_id', 'genre_id'):
+        genres.setdefault(title_id, []).append(genre_id)
+    mean = global_mean()
+    entries = []
+    for title in titles:
+        rating = weighted_rating(
+            title['score_sum'], title['reviews_count'], mean,
+            settings.LEADERBOARD_MIN_REVIEWS,
+        )
+        boards = [ALL]
+        if title['category_id'] is not None:
+            boards.append(category_board(title['category_id']))
+        boards.extend(genre_board(pk) for pk in genres.get(title['id'], ()))
+        entries.extend(
+            LeaderboardEntry(
+                board=board, title_id=title['id'], weighted_rating=rating,
+                reviews_count=title['reviews_count'],
+            )
+            for board in boards
+        )
+    return entries
+
+
+@transaction.atomic
+def refresh_titles(title_ids):
+    """Пересчитывает строки рейтингов указанных произведений."""
+    title_ids = set(title_ids)
+    if not title_ids:
+        return
+    LeaderboardEntry.objects.filter(title_id__in=title_ids).delete()
+    LeaderboardEntry.objects.bulk_create(make_entries(
+        Title.objects.filter(pk__in=title_ids).values(*TITLE_FIELDS)
+    ))
+
+
+def remove_board(board):
+    LeaderboardEntry.objects.filter(board=board).delete()
+
+
+@transaction.atomic
+def rebuild(batch_size=1000):
+    """Строит все рейтинги заново с пересчитанной средней оценкой."""
+    cache.delete(MEAN_KEY)
+    LeaderboardEntry.objects.all().delete()
+    batch = []
+    titles = Title.objects.filter(reviews_count__gt=0).order_by('pk')
+    for title in titles.values(*TITLE_FIELDS).iterator(chunk_size=batch_size):
+        batch.append(title)
+        if len(batch) >= batch_size:
+            LeaderboardEntry.objects.bulk_create(make_entries(batch))
+            batch = []
+    LeaderboardEntry.objects.bulk_create(make_entries(batch))
+
+
+def top(board, limit):
+    """Первые limit строк рейтинга, читаются по индексу leaderboard_top_idx."""
+    return LeaderboardEntry.objects.filter(board=board).order_by(
+        '-weighted_rating', 'title_id',
+    )[:limit]
@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from reviews.export import COLUMNS, FORMATS, export
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка каталога в NDJSON или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-format', choices=FORMATS, default='ndjson',
+            help='Формат выгрузки',
+        )
+        parser.add_argument(
+            '--kind', action='append', choices=COLUMNS, dest='kinds',
+            help='Виды записей (по умолчанию titles); для CSV — один',
+        )
+        parser.add_argument(
+            '--output', help='Файл для записи (по умолчанию stdout)',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Количество строк, читаемых из базы за раз',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            content = export(
+                options['output_format'], options['kinds'] or ['titles'],
+                options['chunk_size'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        if not options['output']:
+            sys.stdout.writelines(content)
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline='',
+        ) as file:
+            file.writelines(content)
@@ -0,0 +1,279 @@
+import csv
+import io
+import os
+import time
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from reviews.leaderboard import rebuild as rebuild_leaderboards
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.search import rebuild_index
+from reviews.signals import titles_updated
+from users.models import User
+
+# Файлы в порядке зависимостей: (файл, модель, {столбец: поле},
+# {столбец: модель, на которую ссылается столбец}).
+SOURCES = (
+    ('users.csv', User, {
+        'id': 'id', 'username': 'username', 'email': 'email',
+        'role': 'role', 'bio': 'bio',
+        'first_name': 'first_name', 'last_name': 'last_name',
+    }, {}),
+    ('category.csv', Category, {
+        'id': 'id', 'name': 'name', 'slug': 'slug',
+    }, {}),
+    ('genre.csv', Genre, {
+        'id': 'id', 'name': 'name', 'slug': 'slug',
+    }, {}),
+    ('titles.csv', Title, {
+        'id': 'id', 'name': 'name', 'year': 'year', 'category': 'category_id',
+    }, {'category': Category}),
+    ('genre_title.csv', GenreTitle, {
+        'id': 'id', 'title_id': 'title_id', 'genre_id': 'genre_id',
+    }, {'title_id': Title, 'genre_id': Genre}),
+    ('review.csv', Review, {
+        'id': 'id', 'title_id': 'title_id', 'text': 'text',
+        'author': 'author_id', 'score': 'score', 'pub_date': 'pub_date',
+    }, {'title_id': Title, 'author': User}),
+    ('comments.csv', Comment, {
+        'id': 'id', 'review_id': 'review_id', 'text': 'text',
+        'author': 'author_id', 'pub_date': 'pub_date',
+    }, {'review_id': Review, 'author': User}),
+)
+
+
+@contextmanager
+def keep_timestamps(model):
+    """Сохраняет даты из файла вместо auto_now_add на время импорта."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class CopyStream(io.TextIOBase):
+    """Файлоподобный поток строк CSV для COPY ... FROM STDIN."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.buffer = ''
+        self.output = io.StringIO()
+        self.writer = csv.writer(self.output)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            self.writer.writerow(
+                r'\N' if value is None else value for value in row
+            )
+            self.buffer += self.output.getvalue()
+            self.output.seek(0)
+            self.output.truncate()
+        if size < 0:
+            size = len(self.buffer)
+        chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+        return chunk  # noqa: R504
+
+
+def copy_defaults(model, columns):
+    """
+    Значения по умолчанию для NOT NULL полей, которых нет в файле: COPY
+    идёт мимо Django, а своих DEFAULT в базе Django 3.2 не создаёт.
+    """
+    attnames = set(columns.values())
+    return {
+        field.attname: field.get_default()
+        for field in model._meta.concrete_fields
+        if field.attname not in attnames
+        and not field.null and not field.primary_key
+    }
+
+
+def copy_source(model, columns, rows):
+    """Команда COPY ... FROM STDIN и поток строк файла для неё."""
+    defaults = copy_defaults(model, columns)
+    extra = list(defaults.values())
+    quote = connection.ops.quote_name
+    db_columns = ', '.join(
+        quote(model._meta.get_field(name).column)
+        for name in [*columns.values(), *defaults]
+    )
+    sql = (
+        f'COPY {quote(model._meta.db_table)} ({db_columns}) '
+        "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+    return sql, CopyStream([*values, *extra] for values in rows)
+
+
+class Command(BaseCommand):
+    help = 'Потоковая загрузка всех csv файлов с данными в базу'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='static/data',
+            help='Каталог с csv файлами',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Количество строк в одном bulk_create',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Проверить файлы без записи в базу',
+        )
+        parser.add_argument(
+            '--no-copy', action='store_true',
+            help='Не использовать COPY даже на Postgres',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+        self.use_copy = (
+            connection.vendor == 'postgresql' and not options['no_copy']
+        )
+        referenced = {
+            model for *_, relations in SOURCES
+            for model in relations.values()
+        }
+        self.known_ids = {}
+        imported = set()
+        for filename, model, columns, relations in SOURCES:
+            path = os.path.join(options['path'], filename)
+            if not os.path.exists(path):
+                print(f'{filename}: файл не найден, пропущен')
+                continue
+            for related in relations.values():
+                if related not in self.known_ids:
+                    self.known_ids[related] = set(
+                        related.objects.values_list('pk', flat=True)
+                    )
+            track = model in referenced
+            if track and model not in self.known_ids:
+                self.known_ids[model] = set(
+                    model.objects.values_list('pk', flat=True)
+                )
+            started = time.monotonic()
+            rows = self.read_rows(path, model, columns, relations, track)
+            if self.dry_run:
+                count = sum(1 for _ in rows)
+            else:
+                count = self.write_rows(model, columns, rows)
+                self.reset_sequence(model)
+            elapsed = time.monotonic() - started
+            rate = count / elapsed if elapsed else count
+            print(
+                f'{filename}: {count} строк за {elapsed:.1f} с '
+                f'({rate:.0f} строк/с)'
+            )
+            imported.add(model)
+        if self.dry_run:
+            print('Проверка выполнена успешно, данные не записаны.')
+        else:
+            self.rebuild_derived(imported)
+            print('Импорт выполнен успешно!')
+
+    def rebuild_derived(self, imported):
+        """Пересчитывает данные, которые bulk-запись обходит сигналами."""
+        if imported & {Title, Review}:
+            Title.objects.all().rebuild_ratings()
+            titles_updated.send(sender=Title, title_ids=None)
+        if imported & {Title, Review, GenreTitle}:
+            rebuild_leaderboards(self.batch_size)
+        if imported & {Title, Review, Comment}:
+            rebuild_index()
+
+    def read_rows(self, path, model, columns, relations, track):
+        """Читает файл построчно, проверяя значения и внешние ключи."""
+        fields = [model._meta.get_field(name) for name in columns.values()]
+        with open(path, newline='', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+            missing = set(columns) - set(reader.fieldnames or ())
+            if missing:
+                raise CommandError(
+                    f'{os.path.basename(path)}: нет столбцов '
+                    f'{", ".join(sorted(missing))}'
+                )
+            for line, row in enumerate(reader, start=2):
+                values = []
+                for column, field in zip(columns, fields):
+                    value = row[column]
+                    try:
+                        value = (
+                            None if value == '' and field.null
+                            else field.to_python(value)
+                        )
+                    except ValidationError:
+                        raise CommandError(
+                            f'{os.path.basename(path)}, строка {line}: '
+                            f'неверное значение {column}={value!r}'
+                        )
+                    related = relations.get(column)
+                    if (
+                        related is not None and value is not None
+                        and value not in self.known_ids[related]
+                    ):
+                        raise CommandError(
+                            f'{os.path.basename(path)}, строка {line}: '
+                            f'запись {related.__name__} с id={value} '
+                            'в базе данных не обнаружена!'
+                        )
+                    values.append(value)
+                if track:
+                    self.known_ids[model].add(values[0])
+                yield values
+
+    @transaction.atomic
+    def write_rows(self, model, columns, rows):
+        """Записывает строки одного файла в одной транзакции."""
+        with keep_timestamps(model):
+            if self.use_copy:
+                return self.copy_rows(model, columns, rows)
+            return self.bulk_create_rows(model, columns, rows)
+
+    def reset_sequence(self, model):
+        """Сдвигает счётчик id после вставки строк с явными id."""
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
+
+    def bulk_create_rows(self, model, columns, rows):
+        attnames = list(columns.values())
+        count = 0
+        batch = []
+        for values in rows:
+            batch.append(model(**dict(zip(attnames, values))))
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+        return count + len(batch)
+
+    def copy_rows(self, model, columns, rows):
+        counted = {'rows': 0}
+
+        def counting():
+            for values in rows:
+                counted['rows'] += 1
+                yield values
+
+        sql, stream = copy_source(model, columns, counting())
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(sql, stream)
+        return counted['rows']
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from reviews.leaderboard import rebuild
+from reviews.models import LeaderboardEntry
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт рейтингов лучших произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество произведений, обрабатываемых за раз',
+        )
+
+    def handle(self, *args, **options):
+        rebuild(options['batch_size'])
+        print(f'Строк рейтингов: {LeaderboardEntry.objects.count()}')
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from reviews.models import Title
+from reviews.signals import titles_updated
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт рейтинга и счётчиков отзывов всех произведений'
+
+    def handle(self, *args, **options):
+        updated = Title.objects.all().rebuild_ratings()
+        titles_updated.send(sender=Title, title_ids=None)
+        print(f'Пересчитано произведений: {updated}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from reviews.models import SearchDocument
+from reviews.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Построение поискового индекса по произведениям и отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество объектов, индексируемых за раз',
+        )
+
+    def handle(self, *args, **options):
+        rebuild_index(options['batch_size'])
+        print(f'Проиндексировано документов: {SearchDocument.objects.count()}')
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.18 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('title', 'title'), ('review', 'review'), ('comment', 'comment')], max_length=16, verbose_name='Тип')),
+                ('object_id', models.BigIntegerField(verbose_name='Id объекта')),
+                ('title_id', models.BigIntegerField(blank=True, null=True, verbose_name='Id произведения')),
+                ('review_id', models.BigIntegerField(blank=True, null=True, verbose_name='Id отзыва')),
+                ('action', models.CharField(choices=[('created', 'created'), ('updated', 'updated'), ('deleted', 'deleted')], max_length=16, verbose_name='Действие')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата изменения')),
+            ],
+        ),
+    ]
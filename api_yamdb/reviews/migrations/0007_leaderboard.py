@@ -0,0 +1,32 @@
+# Generated by Django 3.2.18 on 2026-10-18 18:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=32, verbose_name='Рейтинг')),
+                ('weighted_rating', models.FloatField(verbose_name='Взвешенный рейтинг')),
+                ('reviews_count', models.PositiveIntegerField(verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['board', '-weighted_rating', 'title'], name='leaderboard_top_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='leaderboardentry',
+            unique_together={('board', 'title')},
+        ),
+    ]
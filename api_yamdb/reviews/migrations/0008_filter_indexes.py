@@ -0,0 +1,46 @@
+# Generated by Django 3.2.18 on 2026-10-18 18:34
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# Поиск icontains на Postgres сравнивает UPPER(name::text) LIKE UPPER(...):
+# индекс строится по тому же выражению.
+TRIGRAM_INDEXES = (
+    ('category_name_trgm_idx', 'reviews_category'),
+    ('genre_name_trgm_idx', 'reviews_genre'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, table in TRIGRAM_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX {name} ON {table} '
+                'USING gin (UPPER(name::text) gin_trgm_ops)'
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, _ in TRIGRAM_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_leaderboard'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name'], name='title_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
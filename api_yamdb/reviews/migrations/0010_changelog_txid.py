@@ -0,0 +1,22 @@
+# Generated by Django 3.2.18 on 2026-10-18 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_moderation_hidden'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelog',
+            name='txid',
+            field=models.BigIntegerField(default=0, verbose_name='Транзакция'),
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['txid', 'id'], name='changelog_feed_idx'),
+        ),
+    ]
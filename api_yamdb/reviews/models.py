@@ -1,5 +1,10 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator
-from django.db import models
+from django.db import connections, models
+from django.db.models import (Avg, Case, CharField, Count, F, FloatField,
+                              OuterRef, Subquery, Sum, Value, When)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce
 from users.models import User
 
 
@@ -19,6 +24,91 @@ class Genre(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    def apply_review_delta(self, score_delta, count_delta):
+        """Атомарно сдвигает счётчики отзывов и пересчитывает рейтинг."""
+        new_count = F('reviews_count') + count_delta
+        new_sum = F('score_sum') + score_delta
+        return self.update(
+            reviews_count=new_count,
+            score_sum=new_sum,
+            rating=Case(
+                # После изменения отзывов не осталось — рейтинга нет.
+                When(reviews_count=-count_delta, then=Value(None)),
+                default=Cast(new_sum, FloatField()) / new_count,
+                output_field=FloatField(),
+            ),
+        )
+
+    def rebuild_ratings(self):
+        """Пересчитывает рейтинг и счётчики отзывов с нуля."""
+        reviews = Review.objects.visible().filter(
+            title=OuterRef('pk'),
+        ).order_by().values('title')
+        return self.update(
+            reviews_count=Coalesce(
+                Subquery(reviews.annotate(value=Count('id')).values('value')),
+                0,
+            ),
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(value=Sum('score')).values('value')),
+                0,
+            ),
+            rating=Subquery(
+                reviews.annotate(value=Avg('score')).values('value'),
+                output_field=FloatField(),
+            ),
+        )
+
+    def facets(self, year_bucket=10):
+        """
+        Количество произведений по жанрам, категориям и интервалам лет
+        одним запросом: три группировки объединяются через UNION ALL.
+        """
+        titles = self.order_by().select_related(None).prefetch_related(None)
+
+        def group(queryset, facet, key, name):
+            return queryset.annotate(
+                facet=Value(facet, output_field=CharField()),
+                facet_key=key,
+                facet_name=name,
+            ).values('facet', 'facet_key', 'facet_name').annotate(
+                count=Count('pk'),
+            ).order_by()
+
+        bucket = Cast(F('year') / year_bucket * year_bucket, CharField())
+        rows = group(
+            GenreTitle.objects.filter(
+                title__in=titles.values('pk'), genre__isnull=False,
+            ),
+            'genre', F('genre__slug'), F('genre__name'),
+        ).union(
+            group(
+                titles.filter(category__isnull=False),
+                'category', F('category__slug'), F('category__name'),
+            ),
+            group(titles, 'year', bucket, bucket),
+            all=True,
+        )
+        facets = {'genre': [], 'category': [], 'year': []}
+        for row in rows:
+            if row['facet'] == 'year':
+                start = int(row['facet_key'])
+                facets['year'].append({
+                    'from': start, 'to': start + year_bucket - 1,
+                    'count': row['count'],
+                })
+            else:
+                facets[row['facet']].append({
+                    'slug': row['facet_key'], 'name': row['facet_name'],
+                    'count': row['count'],
+                })
+        facets['genre'].sort(key=lambda item: item['slug'])
+        facets['category'].sort(key=lambda item: item['slug'])
+        facets['year'].sort(key=lambda item: item['from'])
+        return facets
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=200, verbose_name='Название произведения',
@@ -40,11 +130,35 @@ class Title(models.Model):
     genre = models.ManyToManyField(
         Genre, through='GenreTitle', verbose_name='Жанр произведения',
     )
+    rating = models.FloatField(
+        blank=True, null=True, verbose_name='Рейтинг произведения',
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0, verbose_name='Количество отзывов',
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0, verbose_name='Сумма оценок',
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    class Meta:
+        # Точные фильтры TitleFilter по name и year.
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year'], name='title_year_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class ReviewQuerySet(models.QuerySet):
+    def visible(self):
+        """Отзывы, не скрытые модератором."""
+        return self.filter(is_hidden=False)
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
@@ -64,9 +178,33 @@ class Review(models.Model):
     )
     pub_date = models.DateTimeField(
         'Дата добавления', auto_now_add=True,)
+    is_hidden = models.BooleanField(
+        default=False, verbose_name='Скрыт модератором',
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
         unique_together = ('author', 'title',)
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'title_id', 'score', 'is_hidden'} <= set(field_names):
+            instance._loaded_rating = instance.rating_contribution()
+        return instance
+
+    def rating_contribution(self):
+        """Вклад в рейтинг: (произведение, оценка), у скрытого — None."""
+        if self.is_hidden:
+            return None
+        return self.title_id, self.score
 
 
 class GenreTitle(models.Model):
@@ -89,6 +227,12 @@ class GenreTitle(models.Model):
         return f'{self.title} {self.genre}'
 
 
+class CommentQuerySet(models.QuerySet):
+    def visible(self):
+        """Комментарии, не скрытые сами и не под скрытым отзывом."""
+        return self.filter(is_hidden=False, review__is_hidden=False)
+
+
 class Comment(models.Model):
     review = models.ForeignKey(
         Review,
@@ -106,3 +250,158 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         'Дата добавления', auto_now_add=True,
     )
+    is_hidden = models.BooleanField(
+        default=False, verbose_name='Скрыт модератором',
+    )
+
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
+
+
+class SearchDocument(models.Model):
+    """Документ поискового индекса: произведение, отзыв или комментарий."""
+
+    TITLE = 'title'
+    REVIEW = 'review'
+    COMMENT = 'comment'
+    KINDS = (
+        (TITLE, TITLE),
+        (REVIEW, REVIEW),
+        (COMMENT, COMMENT),
+    )
+    kind = models.CharField(max_length=16, choices=KINDS, verbose_name='Тип')
+    object_id = models.BigIntegerField(verbose_name='Id объекта',)
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='search_documents',
+        verbose_name='Произведение',
+    )
+    review = models.ForeignKey(
+        Review,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name='search_documents',
+        verbose_name='Отзыв',
+    )
+    text = models.TextField(verbose_name='Текст',)
+    # Заполняется только на Postgres, индекс GIN создаётся миграцией.
+    vector = SearchVectorField(blank=True, null=True,)
+
+    class Meta:
+        unique_together = ('kind', 'object_id',)
+
+
+class SearchTerm(models.Model):
+    """Инвертированный индекс для баз без полнотекстового поиска."""
+
+    document = models.ForeignKey(
+        SearchDocument,
+        on_delete=models.CASCADE,
+        related_name='terms',
+        verbose_name='Документ',
+    )
+    term = models.CharField(max_length=64, verbose_name='Слово',)
+    weight = models.PositiveIntegerField(verbose_name='Вес',)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['term', 'document'], name='search_term_idx',
+            ),
+        ]
+
+
+class ChangeLogQuerySet(models.QuerySet):
+    def committed(self):
+        """
+        Записи только завершённых транзакций. На Postgres это транзакции
+        старше самой старой из выполняющихся: запись с меньшим ключом
+        (txid, id) уже не появится. В SQLite запись одна на всю базу,
+        txid у всех записей 0 и порядок id совпадает с порядком фиксации.
+        """
+        if connections[self.db].vendor != 'postgresql':
+            return self
+        return self.filter(txid__lt=RawSQL(
+            'txid_snapshot_xmin(txid_current_snapshot())', [],
+        ))
+
+
+class ChangeLog(models.Model):
+    """
+    Журнал изменений для ленты /changes/. Лента упорядочена по
+    (txid, id) и отдаёт записи только завершённых транзакций.
+    """
+
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTIONS = (
+        (CREATED, CREATED),
+        (UPDATED, UPDATED),
+        (DELETED, DELETED),
+    )
+    kind = models.CharField(
+        max_length=16, choices=SearchDocument.KINDS, verbose_name='Тип',
+    )
+    object_id = models.BigIntegerField(verbose_name='Id объекта',)
+    # Родители без внешних ключей: записи об удалении их переживают.
+    title_id = models.BigIntegerField(
+        blank=True, null=True, verbose_name='Id произведения',
+    )
+    review_id = models.BigIntegerField(
+        blank=True, null=True, verbose_name='Id отзыва',
+    )
+    action = models.CharField(
+        max_length=16, choices=ACTIONS, verbose_name='Действие',
+    )
+    changed_at = models.DateTimeField(
+        'Дата изменения', auto_now_add=True,
+    )
+    # txid_current() записавшей транзакции; вне Postgres — 0.
+    txid = models.BigIntegerField(default=0, verbose_name='Транзакция',)
+
+    objects = ChangeLogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('txid', 'id'), name='changelog_feed_idx'),
+        ]
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Строка материализованного рейтинга: общего ('all'), категории
+    ('category:<id>') или жанра ('genre:<id>').
+    """
+
+    board = models.CharField(max_length=32, verbose_name='Рейтинг',)
+    # Без ограничения в базе: строки удаляются сигналом после произведения.
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение',
+    )
+    weighted_rating = models.FloatField(verbose_name='Взвешенный рейтинг',)
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+    )
+
+    class Meta:
+        unique_together = ('board', 'title',)
+        indexes = [
+            models.Index(
+                fields=['board', '-weighted_rating', 'title'],
+                name='leaderboard_top_idx',
+            ),
+        ]
@@ -0,0 +1,134 @@
+from django.db import transaction
+from reviews.changes import log_changes
+from reviews.models import ChangeLog, Comment, Review, SearchDocument, Title
+from reviews.search import index_objects, remove_objects
+from reviews.signals import titles_changed
+
+DELETE = 'delete'
+HIDE = 'hide'
+SHOW = 'show'
+ACTIONS = (DELETE, HIDE, SHOW)
+# Статусы отчёта по каждому id.
+DONE = {DELETE: 'deleted', HIDE: 'hidden', SHOW: 'shown'}
+UNCHANGED = 'unchanged'
+NOT_FOUND = 'not_found'
+
+REVIEW = SearchDocument.REVIEW
+COMMENT = SearchDocument.COMMENT
+# Модель и столбцы (id, id произведения, id отзыва) записей журнала.
+SOURCES = {
+    REVIEW: (Review, ('pk', 'title_id', 'pk')),
+    COMMENT: (Comment, ('pk', 'review__title_id', 'review_id')),
+}
+
+
+class TooManyObjectsError(Exception):
+    """Условиям модерации соответствует больше объектов, чем разрешено."""
+
+
+def select(kind, ids=None, author=None, since=None, until=None):
+    """Отзывы или комментарии по списку id, автору и времени публикации."""
+    lookups = {
+        'pk__in': ids,
+        'author': author,
+        'pub_date__gte': since,
+        'pub_date__lt': until,
+    }
+    return SOURCES[kind][0].objects.filter(**{
+        lookup: value for lookup, value in lookups.items()
+        if value is not None
+    })
+
+
+def raw_delete(queryset):
+    """
+    Один DELETE без загрузки объектов, каскада и сигналов: зависимые
+    строки и производные данные к этому моменту уже обработаны.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def visible_comments(review_ids):
+    return Comment.objects.filter(review_id__in=review_ids, is_hidden=False)
+
+
+def moderate_reviews(action, rows):
+    ids = [row[0] for row in rows]
+    title_ids = {row[1] for row in rows}
+    comments = Comment.objects.filter(review_id__in=ids)
+    if action == SHOW:
+        comments = visible_comments(ids)
+    elif action == HIDE:
+        comments = comments.filter(is_hidden=False)
+    comment_rows = list(comments.values_list(*SOURCES[COMMENT][1]))
+    if action == SHOW:
+        Review.objects.filter(pk__in=ids).update(is_hidden=False)
+        index_objects(list(Review.objects.filter(pk__in=ids)))
+        index_objects(list(visible_comments(ids).select_related('review')))
+        log_changes(REVIEW, rows, ChangeLog.UPDATED)
+        log_changes(COMMENT, comment_rows, ChangeLog.UPDATED)
+    else:
+        # Документы отзывов и их комментариев ссылаются на review_id.
+        SearchDocument.objects.filter(review_id__in=ids).delete()
+        if action == DELETE:
+            raw_delete(Comment.objects.filter(review_id__in=ids))
+            raw_delete(Review.objects.filter(pk__in=ids))
+        else:
+            Review.objects.filter(pk__in=ids).update(is_hidden=True)
+        log_changes(REVIEW, rows, ChangeLog.DELETED)
+        log_changes(COMMENT, comment_rows, ChangeLog.DELETED)
+    Title.objects.filter(pk__in=title_ids).rebuild_ratings()
+    titles_changed(title_ids)
+    return title_ids
+
+
+def moderate_comments(action, rows):
+    ids = [row[0] for row in rows]
+    if action == SHOW:
+        Comment.objects.filter(pk__in=ids).update(is_hidden=False)
+        index_objects(list(
+            Comment.objects.visible().filter(
+                pk__in=ids,
+            ).select_related('review')
+        ))
+        log_changes(COMMENT, rows, ChangeLog.UPDATED)
+    else:
+        remove_objects(COMMENT, ids)
+        if action == DELETE:
+            raw_delete(Comment.objects.filter(pk__in=ids))
+        else:
+            Comment.objects.filter(pk__in=ids).update(is_hidden=True)
+        log_changes(COMMENT, rows, ChangeLog.DELETED)
+    return {row[1] for row in rows}
+
+
+@transaction.atomic
+def moderate(kind, action, queryset, limit):
+    """
+    Удаляет, скрывает или возвращает отзывы либо комментарии несколькими
+    запросами на весь набор, минуя сигналы отдельных объектов, и
+    пересчитывает счётчики рейтинга, рейтинги лучших, поисковый индекс и
+    журнал изменений. Возвращает статусы по id и id затронутых произведений.
+    """
+    columns = SOURCES[kind][1]
+    rows = list(
+        queryset.select_for_update(of=('self',)).order_by('pk').values_list(
+            *columns, 'is_hidden',
+        )[:limit + 1]
+    )
+    if len(rows) > limit:
+        raise TooManyObjectsError
+    changed = [
+        row[:3] for row in rows
+        if action == DELETE or row[3] == (action == SHOW)
+    ]
+    title_ids = set()
+    if changed:
+        handler = moderate_reviews if kind == REVIEW else moderate_comments
+        title_ids = handler(action, changed)
+    changed_ids = {row[0] for row in changed}
+    statuses = {
+        row[0]: DONE[action] if row[0] in changed_ids else UNCHANGED
+        for row in rows
+    }
+    return statuses, title_ids
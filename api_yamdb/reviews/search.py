@@ -0,0 +1,146 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.db import OperationalError, connection, transaction
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast
+from reviews.models import Comment, Review, SearchDocument, SearchTerm, Title
+
+KINDS = {
+    Title: SearchDocument.TITLE,
+    Review: SearchDocument.REVIEW,
+    Comment: SearchDocument.COMMENT,
+}
+# Веса tsvector на Postgres и множители частоты слова для запасного индекса.
+WEIGHTS = {
+    SearchDocument.TITLE: ('A', 4),
+    SearchDocument.REVIEW: ('B', 2),
+    SearchDocument.COMMENT: ('C', 1),
+}
+TERM_RE = re.compile(r'\w+')
+
+
+class SearchTimeoutError(Exception):
+    """Поиск не уложился в SEARCH_TIMEOUT_MS."""
+
+
+def uses_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def tokenize(text):
+    return [term[:64] for term in TERM_RE.findall(text.lower())]
+
+
+def is_hidden(obj):
+    """Скрытые модератором отзывы и комментарии не индексируются."""
+    if isinstance(obj, Review):
+        return obj.is_hidden
+    if isinstance(obj, Comment):
+        return obj.is_hidden or obj.review.is_hidden
+    return False
+
+
+def make_document(obj):
+    kind = KINDS[type(obj)]
+    if kind == SearchDocument.TITLE:
+        return SearchDocument(
+            kind=kind, object_id=obj.pk, title_id=obj.pk,
+            text='\n'.join(filter(None, (obj.name, obj.description))),
+        )
+    if kind == SearchDocument.REVIEW:
+        return SearchDocument(
+            kind=kind, object_id=obj.pk, title_id=obj.title_id,
+            review_id=obj.pk, text=obj.text,
+        )
+    return SearchDocument(
+        kind=kind, object_id=obj.pk, title_id=obj.review.title_id,
+        review_id=obj.review_id, text=obj.text,
+    )
+
+
+def index_objects(objects):
+    """Добавляет в индекс или обновляет объекты одной модели."""
+    if not objects:
+        return
+    kind = KINDS[type(objects[0])]
+    ids = [obj.pk for obj in objects]
+    remove_objects(kind, ids)
+    documents = SearchDocument.objects.bulk_create(
+        [make_document(obj) for obj in objects]
+    )
+    weight, multiplier = WEIGHTS[kind]
+    if uses_postgres():
+        SearchDocument.objects.filter(kind=kind, object_id__in=ids).update(
+            vector=SearchVector(
+                'text', config=settings.SEARCH_CONFIG, weight=weight,
+            ),
+        )
+        return
+    if documents and documents[0].pk is None:
+        documents = SearchDocument.objects.filter(kind=kind, object_id__in=ids)
+    SearchTerm.objects.bulk_create([
+        SearchTerm(document=document, term=term, weight=count * multiplier)
+        for document in documents
+        for term, count in Counter(tokenize(document.text)).items()
+    ])
+
+
+def remove_objects(kind, ids):
+    SearchDocument.objects.filter(kind=kind, object_id__in=ids).delete()
+
+
+def rebuild_index(batch_size=1000):
+    """Строит поисковый индекс заново по всем объектам."""
+    SearchDocument.objects.all().delete()
+    querysets = (
+        Title.objects.all(),
+        Review.objects.visible(),
+        Comment.objects.visible().select_related('review'),
+    )
+    for queryset in querysets:
+        batch = []
+        for obj in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                index_objects(batch)
+                batch = []
+        index_objects(batch)
+
+
+def search(query):
+    """Документы, содержащие все слова запроса, с рангом релевантности."""
+    if uses_postgres():
+        search_query = SearchQuery(query, config=settings.SEARCH_CONFIG)
+        # ts_rank возвращает real; в курсоре пагинации ранг должен
+        # совпадать с float8, с которым его сравнивает Postgres.
+        return SearchDocument.objects.filter(vector=search_query).annotate(
+            rank=Cast(SearchRank(F('vector'), search_query), FloatField()),
+        )
+    terms = set(tokenize(query))
+    return SearchDocument.objects.filter(terms__term__in=terms).annotate(
+        matched=Count('terms__term', distinct=True),
+        rank=Cast(Sum('terms__weight'), FloatField()),
+    ).filter(matched=len(terms))
+
+
+@contextmanager
+def search_timeout():
+    """Ограничивает время поисковых запросов на Postgres."""
+    if not uses_postgres():
+        yield
+        return
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SET LOCAL statement_timeout = %s',
+                    [settings.SEARCH_TIMEOUT_MS],
+                )
+            yield
+    except OperationalError as error:
+        raise SearchTimeoutError from error
@@ -0,0 +1,172 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import Signal, receiver
+from reviews.changes import log_change, log_changes
+from reviews.leaderboard import (category_board, genre_board, refresh_titles,
+                                 remove_board)
+from reviews.models import (Category, ChangeLog, Comment, Genre, GenreTitle,
+                            LeaderboardEntry, Review, SearchDocument, Title)
+from reviews.search import KINDS, index_objects, is_hidden, remove_objects
+
+# Рейтинг, счётчики отзывов или жанры произведений изменились без
+# сохранения Title. title_ids — id произведений, None — все произведения.
+titles_updated = Signal()
+
+
+def titles_changed(title_ids):
+    """
+    Обновляет рейтинги лучших, пишет в журнал изменение произведений
+    и оповещает о нём остальные приложения.
+    """
+    title_ids = set(title_ids)
+    if not title_ids:
+        return
+    refresh_titles(title_ids)
+    log_changes(
+        SearchDocument.TITLE,
+        [(title_id, title_id, None) for title_id in sorted(title_ids)],
+        ChangeLog.UPDATED,
+    )
+    titles_updated.send(sender=Title, title_ids=title_ids)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """
+    Обновляет рейтинг произведения при создании, изменении и скрытии
+    отзыва: снимает прежний вклад отзыва и добавляет новый.
+    """
+    if not created and not hasattr(instance, '_loaded_rating'):
+        Title.objects.filter(pk=instance.title_id).rebuild_ratings()
+        titles_changed([instance.title_id])
+        instance._loaded_rating = instance.rating_contribution()
+        return
+    old = None if created else instance._loaded_rating
+    new = instance.rating_contribution()
+    instance._loaded_rating = new
+    if old == new:
+        return
+    if old and new and old[0] == new[0]:
+        Title.objects.filter(pk=new[0]).apply_review_delta(
+            new[1] - old[1], 0,
+        )
+    else:
+        if old:
+            Title.objects.filter(pk=old[0]).apply_review_delta(-old[1], -1)
+        if new:
+            Title.objects.filter(pk=new[0]).apply_review_delta(new[1], 1)
+    titles_changed(
+        contribution[0] for contribution in (old, new) if contribution
+    )
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Обновляет рейтинг произведения при удалении отзыва, в т.ч. каскадном."""
+    if instance.is_hidden:
+        return
+    Title.objects.filter(pk=instance.title_id).apply_review_delta(
+        -instance.score, -1,
+    )
+    titles_changed([instance.title_id])
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def update_search_index(sender, instance, **kwargs):
+    """Переиндексирует сохранённый объект, скрытый — убирает из индекса."""
+    if is_hidden(instance):
+        remove_objects(KINDS[sender], [instance.pk])
+    else:
+        index_objects([instance])
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Удаляет объект из поискового индекса, в т.ч. при каскадном удалении."""
+    remove_objects(KINDS[sender], [instance.pk])
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def log_save(sender, instance, created, **kwargs):
+    log_change(instance, ChangeLog.CREATED if created else ChangeLog.UPDATED)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def log_delete(sender, instance, **kwargs):
+    """Запись об удалении, в т.ч. каскадном от произведения и отзыва."""
+    log_change(instance, ChangeLog.DELETED)
+
+
+@receiver(post_save, sender=Title)
+def refresh_title_leaderboards(sender, instance, created, **kwargs):
+    """Категория произведения определяет его рейтинги."""
+    if not created:
+        refresh_titles([instance.pk])
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_leaderboards(sender, instance, **kwargs):
+    LeaderboardEntry.objects.filter(title_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def refresh_genre_title_leaderboards(sender, instance, **kwargs):
+    titles_changed([instance.title_id])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def refresh_leaderboards_on_genre_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if reverse and action == 'pre_clear':
+        # После clear() связей жанра с произведениями уже не найти.
+        instance._cleared_title_ids = list(
+            GenreTitle.objects.filter(
+                genre=instance,
+            ).values_list('title_id', flat=True)
+        )
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        titles_changed([instance.pk])
+    elif action == 'post_clear':
+        remove_board(genre_board(instance.pk))
+        titles_changed(instance.__dict__.pop('_cleared_title_ids', ()))
+    else:
+        titles_changed(pk_set)
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_titles(sender, instance, **kwargs):
+    """SET_NULL снимет категорию с произведений запросом без сигналов."""
+    instance._title_ids = list(instance.titles.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Genre)
+def remember_genre_titles(sender, instance, **kwargs):
+    instance._title_ids = list(
+        GenreTitle.objects.filter(
+            genre=instance,
+        ).values_list('title_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Category)
+def remove_category_leaderboard(sender, instance, **kwargs):
+    remove_board(category_board(instance.pk))
+    titles_changed(instance.__dict__.pop('_title_ids', ()))
+
+
+@receiver(post_delete, sender=Genre)
+def remove_genre_leaderboard(sender, instance, **kwargs):
+    remove_board(genre_board(instance.pk))
+    titles_changed(instance.__dict__.pop('_title_ids', ()))
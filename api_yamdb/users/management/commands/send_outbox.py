@@ -0,0 +1,84 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import OutboxMessage
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди пачками через одно SMTP-соединение'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых за одно соединение',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, опрашивая очередь',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами пустой очереди, с',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = self.send_batch(options['batch_size'])
+            if sent:
+                print(f'Отправлено писем: {sent}')
+            if not options['loop']:
+                return
+            if not sent:
+                time.sleep(options['interval'])
+
+    def retry_at(self, attempts):
+        """Экспоненциальная задержка перед повторной попыткой."""
+        return timezone.now() + timedelta(
+            seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+        )
+
+    @transaction.atomic
+    def send_batch(self, batch_size):
+        batch = list(
+            OutboxMessage.objects.pending(
+                settings.OUTBOX_MAX_ATTEMPTS,
+            ).select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not batch:
+            return 0
+        sent = 0
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for message in batch:
+                try:
+                    connection.send_messages([EmailMessage(
+                        message.subject, message.body,
+                        message.from_email, [message.recipient],
+                        connection=connection,
+                    )])
+                except Exception as error:
+                    self.fail(message, error)
+                else:
+                    message.sent_at = timezone.now()
+                    sent += 1
+        except Exception as error:
+            for message in batch:
+                if message.sent_at is None:
+                    self.fail(message, error)
+        finally:
+            connection.close()
+        OutboxMessage.objects.bulk_update(
+            batch, ['attempts', 'next_attempt_at', 'sent_at', 'last_error'],
+        )
+        return sent
+
+    def fail(self, message, error):
+        message.attempts += 1
+        message.last_error = str(error)
+        message.next_attempt_at = self.retry_at(message.attempts)
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -38,8 +39,33 @@ class User(AbstractUser):
         unique=True
     )
     bio = models.TextField(verbose_name="О себе", blank=True, null=True)
+    token_version = models.PositiveIntegerField(
+        verbose_name='Версия токенов', default=0,
+    )
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', ]
+    ACCESS_FIELDS = ('role', 'is_active', 'is_staff', 'is_superuser')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(cls.ACCESS_FIELDS) <= set(field_names):
+            instance._loaded_access = instance.get_access()
+        return instance
+
+    def get_access(self):
+        return tuple(getattr(self, field) for field in self.ACCESS_FIELDS)
+
+    def save(self, *args, **kwargs):
+        """Смена роли или деактивация отзывает выданные токены."""
+        loaded = getattr(self, '_loaded_access', None)
+        if loaded is not None and loaded != self.get_access():
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_access = self.get_access()
 
     @property
     def is_user(self):
@@ -52,3 +78,48 @@ class User(AbstractUser):
     @property
     def is_admin(self):
         return self.role == self.ADMIN
+
+
+class OutboxMessageQuerySet(models.QuerySet):
+    def pending(self, max_attempts):
+        """Неотправленные письма, время очередной попытки которых настало."""
+        return self.filter(
+            sent_at__isnull=True,
+            attempts__lt=max_attempts,
+            next_attempt_at__lte=timezone.now(),
+        ).order_by('next_attempt_at', 'id')
+
+
+class OutboxMessage(models.Model):
+    """Письмо в очереди на отправку."""
+
+    subject = models.CharField(verbose_name='Тема', max_length=255)
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(verbose_name='Отправитель', max_length=254)
+    recipient = models.EmailField(verbose_name='Получатель', max_length=254)
+    created_at = models.DateTimeField(
+        verbose_name='Дата постановки в очередь', auto_now_add=True,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Количество попыток', default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Время следующей попытки', default=timezone.now,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки', blank=True, null=True,
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+
+    objects = OutboxMessageQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'next_attempt_at'],
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
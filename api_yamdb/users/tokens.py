@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+
+TOKEN_VERSION_KEY = 'token-version:{}'
+# Версия удалённых и неактивных пользователей: не совпадёт ни с одним токеном.
+REVOKED = -1
+
+
+def access_token_for(user):
+    """Выпускает токен доступа с ролью и версией токенов пользователя."""
+    token = AccessToken.for_user(user)
+    token['username'] = user.username
+    token['role'] = user.role
+    token['is_staff'] = user.is_staff
+    token['is_superuser'] = user.is_superuser
+    token['token_version'] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    """Версия токенов пользователя, закэшированная на короткое время."""
+    key = TOKEN_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True,
+        ).values_list('token_version', flat=True).first()
+        if version is None:
+            version = REVOKED
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_token_version(user_id):
+    cache.delete(TOKEN_VERSION_KEY.format(user_id))
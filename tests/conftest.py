@@ -1,9 +1,19 @@
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+from django.core.cache import cache
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
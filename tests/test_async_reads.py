@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from api import async_views
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def review():
+    title = Title.objects.create(name='Произведение', year=2000)
+    author = User.objects.create(username='author', email='author@ya.ru')
+    review = Review.objects.create(
+        title=title, author=author, text='Текст', score=8,
+    )
+    Comment.objects.create(review=review, author=author, text='Комментарий')
+    return review
+
+
+@pytest.mark.django_db
+class TestAsyncReads:
+
+    def test_hot_routes_are_async(self, review):
+        prefix = f'/api/v1/titles/{review.title_id}'
+        for url in (
+            '/api/v1/titles/', f'{prefix}/',
+            f'{prefix}/reviews/', f'{prefix}/reviews/{review.id}/comments/',
+        ):
+            assert asyncio.iscoroutinefunction(resolve(url).func), (
+                f'Проверьте, что {url} обслуживается асинхронным представлением'
+            )
+        assert not asyncio.iscoroutinefunction(
+            resolve('/api/v1/categories/').func
+        )
+
+    def test_same_responses_under_asgi(self, client, review):
+        prefix = f'/api/v1/titles/{review.title_id}'
+        async_client = AsyncClient()
+
+        async def fetch(url):
+            return await async_client.get(url)
+
+        for url in (
+            '/api/v1/titles/', f'{prefix}/',
+            f'{prefix}/reviews/', f'{prefix}/reviews/{review.id}/comments/',
+        ):
+            expected = client.get(url)
+            response = async_to_sync(fetch)(url)
+            assert response.status_code == expected.status_code == 200
+            assert response.json() == expected.json(), (
+                'Ответ асинхронного представления должен совпадать с WSGI'
+            )
+
+    def test_write_through_async_route(self, client, review):
+        response = client.post('/api/v1/titles/', {'name': 'Новое'})
+        assert response.status_code == 401
+
+    def test_thread_pool_closes_connections(self, monkeypatch):
+        closed = []
+        monkeypatch.setattr(
+            async_views, 'close_old_connections', lambda: closed.append(True),
+        )
+
+        def view(request):
+            return 'ответ'
+
+        assert async_views.run_view(view, object(), (), {}, True) == 'ответ'
+        assert closed, (
+            'Проверьте, что поток пула освобождает соединения с базой'
+        )
+        closed.clear()
+        async_views.run_view(view, object(), (), {}, False)
+        assert not closed
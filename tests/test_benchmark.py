@@ -0,0 +1,94 @@
+import json
+import tracemalloc
+
+import pytest
+from api.benchmark import Benchmark
+from django.core.management import CommandError, call_command
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+
+    def test_seed_benchmark(self):
+        call_command('seed_benchmark', scale='tiny', reviews=100, comments=50)
+        assert Title.objects.count() == 50, (
+            'seed_benchmark должна создать произведения заданного масштаба'
+        )
+        assert Review.objects.count() == 100
+        assert Comment.objects.count() == 50
+        assert User.objects.count() == 20
+        title = Title.objects.filter(reviews_count__gt=0).first()
+        assert title.reviews_count == title.reviews.count(), (
+            'После заполнения счётчики отзывов должны быть пересчитаны'
+        )
+
+    def test_seed_benchmark_skips_existing_rows(self):
+        user = User.objects.create(username='reader', email='reader@ya.ru')
+        call_command('seed_benchmark', scale='tiny', reviews=100, comments=50)
+        assert not Review.objects.filter(author=user).exists(), (
+            'Данные должны ссылаться только на созданные объекты'
+        )
+
+    def test_seed_benchmark_too_many_reviews(self):
+        with pytest.raises(CommandError):
+            call_command(
+                'seed_benchmark', scale='tiny', users=1, titles=1, reviews=2,
+            )
+
+    def test_benchmark_baseline(self, tmp_path):
+        call_command('seed_benchmark', scale='tiny')
+        output = tmp_path / 'baseline.json'
+        call_command('benchmark', requests=3, output=str(output))
+        result = json.loads(output.read_text(encoding='utf-8'))
+        assert set(result['scenarios']) == {
+            'titles_list', 'titles_filter', 'reviews_page',
+            'comments_page', 'signup', 'token',
+        }
+        for name, scenario in result['scenarios'].items():
+            assert scenario['errors'] == 0, (
+                f'Сценарий {name} не должен возвращать ошибки'
+            )
+            assert scenario['p50_ms'] <= scenario['p99_ms']
+            assert scenario['queries_per_request'] > 0
+        assert result['meta']['titles'] == 50
+
+        call_command(
+            'benchmark', requests=3, baseline=str(output),
+            scenario=['titles_list'], max_regression=1000000,
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_queries_in_thread_pool(self, settings):
+        call_command('seed_benchmark', scale='tiny')
+        settings.ASYNC_READ_THREAD_POOL = True
+        result = Benchmark(requests=2).run(['titles_list', 'reviews_page'])
+        for name, scenario in result.items():
+            assert scenario['queries_per_request'] > 0, (
+                f'Сценарий {name}: учитывайте запросы из пула потоков'
+            )
+
+    def test_latency_measured_without_tracemalloc(self):
+        call_command('seed_benchmark', scale='tiny')
+        benchmark = Benchmark(requests=2)
+        traced = []
+
+        def prepare():
+            request = benchmark.titles_list()
+
+            def traced_request():
+                traced.append(tracemalloc.is_tracing())
+                return request()
+
+            return traced_request
+
+        result = benchmark.run_scenario(prepare)
+        assert traced == [False, False, True, True], (
+            'Задержка и пиковая память измеряются разными прогонами'
+        )
+        assert result['peak_memory_kb'] > 0
+
+    def test_benchmark_requires_data(self):
+        with pytest.raises(CommandError):
+            call_command('benchmark', requests=1)
@@ -0,0 +1,148 @@
+from base64 import b64encode
+
+import pytest
+from reviews.models import Category, ChangeLog, Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def review():
+    title = Title.objects.create(name='Произведение', year=2000)
+    author = User.objects.create(username='author', email='author@ya.ru')
+    review = Review.objects.create(
+        title=title, author=author, text='Текст', score=8,
+    )
+    Comment.objects.create(review=review, author=author, text='Комментарий')
+    return review
+
+
+def walk(client, since='', limit=2):
+    changes = []
+    params = {'since': since, 'limit': limit}
+    while True:
+        data = client.get('/api/v1/changes/', params).json()
+        changes.extend(data['results'])
+        if not data['next']:
+            return changes, data['since']
+        params['since'] = data['since']
+
+
+@pytest.mark.django_db
+class TestChangesFeed:
+
+    def test_created(self, client, review):
+        changes, _ = walk(client)
+        assert [(item['type'], item['action']) for item in changes] == [
+            ('title', 'created'), ('title', 'updated'),
+            ('review', 'created'), ('comment', 'created'),
+        ]
+        assert changes[2]['data']['text'] == 'Текст'
+        assert changes[1]['data']['rating'] == 8, (
+            'Проверьте, что новый рейтинг попадает в ленту'
+        )
+        assert changes[3]['title_id'] == review.title_id
+        assert changes[3]['review_id'] == review.id
+
+    def test_poll_from_token(self, client, review):
+        _, since = walk(client)
+        review.text = 'Исправлено'
+        review.save()
+        changes, new_since = walk(client, since)
+        assert [(item['type'], item['action']) for item in changes] == [
+            ('review', 'updated'),
+        ], 'Проверьте, что лента отдаёт только изменения после since'
+        assert changes[0]['data']['text'] == 'Исправлено'
+        assert walk(client, new_since)[0] == []
+
+    def test_cascade_tombstones(self, client, review):
+        _, since = walk(client)
+        comment_id = review.comments.get().id
+        Title.objects.get(pk=review.title_id).delete()
+        changes, _ = walk(client, since)
+        deleted = {
+            (item['type'], item['object_id']) for item in changes
+            if item['action'] == 'deleted'
+        }
+        assert deleted == {
+            ('title', review.title_id), ('review', review.id),
+            ('comment', comment_id),
+        }, 'Проверьте, что каскадное удаление оставляет записи в ленте'
+        assert all(item['data'] is None for item in changes)
+
+    def test_rating_change_on_cascade_delete(self, client, review):
+        _, since = walk(client)
+        review.author.delete()
+        changes, _ = walk(client, since)
+        assert ('title', 'updated', review.title_id) in {
+            (item['type'], item['action'], item['object_id'])
+            for item in changes
+        }, 'Проверьте запись о новом рейтинге после каскадного удаления'
+        title = next(item for item in changes if item['type'] == 'title')
+        assert title['data']['rating'] is None
+
+    def test_genre_changes(self, client, review):
+        title = Title.objects.get(pk=review.title_id)
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        _, since = walk(client)
+        title.genre.add(drama)
+        changes, since = walk(client, since)
+        assert [
+            (item['type'], item['action'], item['data']['genre'])
+            for item in changes
+        ] == [
+            ('title', 'updated', [{'name': 'Драма', 'slug': 'drama'}]),
+        ], 'Проверьте запись о добавлении жанра'
+        drama.delete()
+        changes, since = walk(client, since)
+        assert [
+            (item['type'], item['action'], item['data']['genre'])
+            for item in changes
+        ] == [('title', 'updated', [])], 'Проверьте запись об удалении жанра'
+
+    def test_category_delete(self, client, review):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        Title.objects.filter(pk=review.title_id).update(category=category)
+        _, since = walk(client)
+        category.delete()
+        changes, _ = walk(client, since)
+        assert [
+            (item['type'], item['action'], item['data']['category'])
+            for item in changes
+        ] == [('title', 'updated', None)], (
+            'Проверьте запись об удалении категории произведения'
+        )
+
+    def test_page_queries(
+        self, client, review, django_assert_num_queries,
+    ):
+        for i in range(20):
+            Comment.objects.create(
+                review=review, author=review.author, text=f'Ещё {i}',
+            )
+        # Страница журнала, произведения с жанрами, отзывы, комментарии.
+        with django_assert_num_queries(5):
+            response = client.get('/api/v1/changes/', {'limit': 100})
+        assert len(response.json()['results']) == ChangeLog.objects.count()
+
+    def test_invalid_token(self, client):
+        response = client.get('/api/v1/changes/', {'since': 'не токен'})
+        assert response.status_code == 404
+
+    def test_ordered_by_transaction(self, client):
+        # Транзакция 5 записала журнал позже транзакции 7.
+        ChangeLog.objects.bulk_create([
+            ChangeLog(kind='title', object_id=1, action='deleted', txid=7),
+            ChangeLog(kind='title', object_id=2, action='deleted', txid=5),
+        ])
+        changes, _ = walk(client, limit=1)
+        assert [item['object_id'] for item in changes] == [2, 1], (
+            'Проверьте, что лента упорядочена по (txid, id)'
+        )
+
+    def test_legacy_token(self, client, review):
+        first = ChangeLog.objects.order_by('id').first()
+        since = b64encode(str(first.id).encode()).decode()
+        changes, _ = walk(client, since)
+        assert len(changes) == ChangeLog.objects.count() - 1, (
+            'Проверьте, что курсор из одного id по-прежнему принимается'
+        )
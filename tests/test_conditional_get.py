@@ -0,0 +1,115 @@
+import pytest
+from rest_framework.test import APIClient
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def review():
+    title = Title.objects.create(name='Произведение', year=2000)
+    author = User.objects.create(username='author', email='author@ya.ru')
+    review = Review.objects.create(
+        title=title, author=author, text='Текст', score=8,
+    )
+    Comment.objects.create(review=review, author=author, text='Комментарий')
+    return review
+
+
+def urls(review):
+    prefix = f'/api/v1/titles/{review.title_id}'
+    return (
+        '/api/v1/titles/',
+        f'{prefix}/',
+        f'{prefix}/reviews/',
+        f'{prefix}/reviews/{review.id}/',
+        f'{prefix}/reviews/{review.id}/comments/',
+    )
+
+
+class TestConditionalGet:
+
+    @pytest.mark.django_db
+    def test_validators_present(self, client, review):
+        for url in urls(review):
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ {url} содержит ETag'
+            )
+            assert response.has_header('Last-Modified')
+
+    @pytest.mark.django_db
+    def test_not_modified(self, client, review):
+        for url in urls(review):
+            etag = client.get(url)['ETag']
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304, (
+                f'Проверьте, что {url} отвечает 304 на совпадающий ETag'
+            )
+            assert response['ETag'] == etag
+            assert not response.content
+
+    @pytest.mark.django_db
+    def test_if_modified_since(self, client, review):
+        url = urls(review)[2]
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+
+    @pytest.mark.django_db
+    def test_not_modified_skips_queryset(
+        self, client, review, django_assert_num_queries,
+    ):
+        url = urls(review)[4]
+        etag = client.get(url)['ETag']
+        # Только отзыв из URL и агрегат валидатора.
+        with django_assert_num_queries(2):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    @pytest.mark.django_db
+    def test_pages_have_different_etags(self, client, review):
+        url = urls(review)[0]
+        assert (
+            client.get(url)['ETag'] != client.get(url, {'limit': 1})['ETag']
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_edit_changes_etag(self, client, review):
+        for url in urls(review)[2:]:
+            etag = client.get(url)['ETag']
+            comment = Comment.objects.get(review=review)
+            comment.text = 'Исправлено'
+            comment.save()
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что изменение комментария меняет ETag {url}'
+            )
+
+    @pytest.mark.django_db
+    def test_new_comment_changes_etag(self, client, review):
+        url = urls(review)[4]
+        etag = client.get(url)['ETag']
+        Comment.objects.create(
+            review=review, author=review.author, text='Ещё',
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cascade_delete_changes_title_etag(self, client, review):
+        admin = User.objects.create(
+            username='admin', email='admin@ya.ru', role=User.ADMIN,
+        )
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin)
+        etags = {url: client.get(url)['ETag'] for url in urls(review)[:2]}
+        response = admin_client.delete('/api/v1/users/author/')
+        assert response.status_code == 204
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что каскадное удаление отзыва меняет ETag {url}'
+            )
+        assert response.json()['rating'] is None
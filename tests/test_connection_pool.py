@@ -0,0 +1,119 @@
+import os
+import threading
+
+import pytest
+from django.db import connection
+
+from api_yamdb import settings
+from api_yamdb.db import close_unusable_connections
+from api_yamdb.db.pool import ConnectionPool, PoolTimeoutError, get_pool
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise RuntimeError('server closed the connection')
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class TestConnectionPool:
+
+    def test_settings_from_env(self):
+        database = settings.DATABASES['default']
+        assert database['CONN_MAX_AGE'] == 60, (
+            'Проверьте, что соединения с базой по умолчанию постоянные'
+        )
+        assert database['CONN_HEALTH_CHECKS'] is True
+        assert database['POOL'] == {'MAX_SIZE': 10, 'TIMEOUT': 5}
+
+    def test_reuse(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        assert pool.acquire(FakeConnection) is first, (
+            'Проверьте, что пул отдаёт возвращённое соединение повторно'
+        )
+        assert first.rollbacks == 1
+        assert pool.stats()['created'] == 1
+
+    def test_broken_connection_replaced(self):
+        pool = ConnectionPool(max_size=1, timeout=1)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        first.broken = True
+        second = pool.acquire(FakeConnection)
+        assert second is not first
+        assert first.closed
+        assert pool.stats()['size'] == 1
+
+    def test_saturation(self):
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        held = pool.acquire(FakeConnection)
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(FakeConnection)
+        timer = threading.Timer(0.01, pool.release, [held])
+        pool.timeout = 1
+        timer.start()
+        assert pool.acquire(FakeConnection) is held
+        timer.join()
+        stats = pool.stats()
+        assert stats['timeouts'] == 1
+        assert stats['waits'] == 1
+        assert stats['wait_time'] > 0
+        assert stats['in_use'] == 1
+
+    def test_failed_connect_frees_slot(self):
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+
+        def connect():
+            raise RuntimeError('connection refused')
+
+        with pytest.raises(RuntimeError):
+            pool.acquire(connect)
+        assert pool.acquire(FakeConnection)
+
+    @pytest.mark.django_db
+    def test_metrics(self, client):
+        pool = get_pool('metrics-test', {'POOL': {'MAX_SIZE': 3}})
+        pool.acquire(FakeConnection)
+        text = client.get('/metrics/').content.decode()
+        labels = f'alias="metrics-test",pid="{os.getpid()}"'
+        assert f'yamdb_db_pool_in_use{{{labels}}} 1' in text
+        assert f'yamdb_db_pool_max_size{{{labels}}} 3' in text
+
+    @pytest.mark.django_db
+    def test_unusable_connection_closed(self, monkeypatch):
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECKS', True)
+        monkeypatch.setattr(connection, 'in_atomic_block', False)
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        closed = []
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+        close_unusable_connections()
+        assert closed, 'Проверьте, что разорванное соединение закрывается'
@@ -0,0 +1,140 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+from api.async_views import sync_iterator
+from django.core.management import CommandError, call_command
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+from users.tokens import access_token_for
+
+
+@pytest.fixture
+def catalog():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    author = User.objects.create(username='author', email='author@ya.ru')
+    for i in range(3):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000 + i, category=category,
+        )
+        title.genre.set(genres[:i])
+        review = Review.objects.create(
+            title=title, author=author, text='Текст', score=i + 1,
+        )
+        Comment.objects.create(review=review, author=author, text='Да')
+    return category
+
+
+@pytest.fixture
+def admin_auth():
+    admin = User.objects.create(
+        username='admin', email='admin@ya.ru', role=User.ADMIN,
+    )
+    return {'HTTP_AUTHORIZATION': f'Bearer {access_token_for(admin)}'}
+
+
+def read(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_ndjson(self, client, catalog, admin_auth):
+        response = client.get(
+            '/api/v1/export/', {'kind': 'titles,reviews,comments'},
+            **admin_auth,
+        )
+        assert response.status_code == 200
+        assert response.streaming, 'Проверьте, что выгрузка потоковая'
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        records = [json.loads(line) for line in read(response).splitlines()]
+        assert [record['type'] for record in records] == (
+            ['title'] * 3 + ['review'] * 3 + ['comment'] * 3
+        )
+        title = records[2]
+        assert title['category'] == 'movie'
+        assert title['genre'] == ['comedy', 'drama']
+        assert title['rating'] == 3
+        assert records[3]['author'] == 'author'
+
+    def test_csv(self, client, catalog, admin_auth):
+        response = client.get(
+            '/api/v1/export/', {'output': 'csv'}, **admin_auth,
+        )
+        rows = list(csv.reader(io.StringIO(read(response))))
+        assert rows[0] == [
+            'id', 'name', 'year', 'description', 'category', 'genre',
+            'rating',
+        ]
+        assert len(rows) == 4
+        assert rows[3][5] == 'comedy,drama'
+
+    def test_deleted_genre(self, client, catalog, admin_auth):
+        Genre.objects.get(slug='comedy').delete()
+        response = client.get(
+            '/api/v1/export/', {'output': 'csv'}, **admin_auth,
+        )
+        rows = list(csv.reader(io.StringIO(read(response))))
+        assert rows[3][5] == 'drama', (
+            'Проверьте выгрузку при связях с удалённым жанром'
+        )
+
+    def test_invalid_params(self, client, admin_auth):
+        for params in (
+            {'output': 'xml'}, {'kind': 'users'},
+            {'output': 'csv', 'kind': 'titles,reviews'},
+        ):
+            response = client.get('/api/v1/export/', params, **admin_auth)
+            assert response.status_code == 400
+
+    def test_admin_only(self, client, catalog):
+        assert client.get('/api/v1/export/').status_code == 401
+        user = User.objects.get(username='author')
+        response = client.get(
+            '/api/v1/export/',
+            HTTP_AUTHORIZATION=f'Bearer {access_token_for(user)}',
+        )
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+
+    def test_command(self, catalog, tmp_path):
+        output = tmp_path / 'reviews.csv'
+        call_command(
+            'export_data', output_format='csv', kinds=['reviews'],
+            output=str(output), chunk_size=2,
+        )
+        rows = list(csv.reader(output.open(encoding='utf-8')))
+        assert len(rows) == 4
+        with pytest.raises(CommandError):
+            call_command(
+                'export_data', output_format='csv',
+                kinds=['titles', 'reviews'],
+            )
+
+
+class TestSyncIterator:
+
+    def test_inside_event_loop(self):
+        async def consume(iterable):
+            return list(sync_iterator(iterable))
+
+        assert asyncio.run(consume(iter(range(100)))) == list(range(100))
+
+    def test_error_propagates(self):
+        def failing():
+            yield 1
+            raise RuntimeError('ошибка базы')
+
+        async def consume():
+            return list(sync_iterator(failing()))
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(consume())
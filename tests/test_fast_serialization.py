@@ -0,0 +1,64 @@
+import pytest
+from api.views import TitleViewSet
+from django.core.cache import cache
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+PARAMS = (
+    {},
+    {'limit': 5, 'offset': 3},
+    {'genre': 'genre-1'},
+    {'category': 'category-0', 'year': 2001},
+    {'fields': 'id,name,rating'},
+    {'fields': 'category,genre', 'expand': ''},
+    {'expand': 'genre'},
+)
+
+
+@pytest.fixture
+def titles():
+    author = User.objects.create(username='author', email='author@ya.ru')
+    categories = [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(2)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр «{i}» ', slug=f'genre-{i}')
+        for i in range(4)
+    ]
+    for i in range(15):
+        title = Title.objects.create(
+            name=f'Произведение "{i}"', year=2000 + i % 3,
+            category=categories[i % 2] if i % 5 else None,
+            description=None if i % 4 else f'Описание {i}',
+        )
+        # Жанры назначаются не по порядку id.
+        title.genre.set(genres[i % 4:][::-1])
+        if i % 3:
+            Review.objects.create(
+                title=title, author=author, text='Текст', score=i % 10 + 1,
+            )
+    # Связи удалённого жанра остаются с genre = NULL.
+    genres[2].delete()
+
+
+@pytest.mark.django_db
+class TestFastSerialization:
+
+    def fetch(self, client, monkeypatch, fast, params):
+        monkeypatch.setattr(TitleViewSet, 'fast_list', fast)
+        cache.clear()
+        response = client.get('/api/v1/titles/', params)
+        assert response.status_code == 200
+        return response.content
+
+    def test_output_matches_serializers(self, client, monkeypatch, titles):
+        for params in PARAMS:
+            assert self.fetch(client, monkeypatch, True, params) == (
+                self.fetch(client, monkeypatch, False, params)
+            ), f'Быстрый вывод отличается от сериализатора для {params}'
+
+    def test_queries(self, client, titles, django_assert_num_queries):
+        # COUNT(*), произведения с категориями, жанры всех произведений.
+        with django_assert_num_queries(3):
+            client.get('/api/v1/titles/', {'limit': 15})
@@ -0,0 +1,96 @@
+import csv
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from reviews.management.commands.import_data import SOURCES, copy_source
+from reviews.models import Comment, GenreTitle, Review, Title
+from users.models import User
+
+FILES = {
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '1,bingobongo,bingobongo@yamdb.fake,user,,,\n'
+        '2,capt_obvious,capt_obvious@yamdb.fake,admin,,,\n'
+    ),
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n2,Книга,book\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Крёстный отец,1972,1\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,2,1\n3,2,2\n',
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Отлично,1,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Хорошо,2,6,2019-09-24T21:08:21.567Z\n'
+        '3,2,Неплохо,1,7,2019-09-24T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,2,2019-09-24T21:08:21.567Z\n'
+    ),
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name, content in FILES.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestImportData:
+
+    def test_import(self, data_dir):
+        call_command('import_data', path=str(data_dir), batch_size=2)
+        assert User.objects.count() == 2
+        assert GenreTitle.objects.count() == 3
+        assert Comment.objects.count() == 1
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата отзыва берётся из файла'
+        )
+        title = Title.objects.get(pk=1)
+        assert (title.rating, title.reviews_count) == (8, 2), (
+            'Проверьте, что после импорта пересчитывается рейтинг'
+        )
+
+    def test_dry_run_does_not_write(self, data_dir, capsys):
+        call_command('import_data', path=str(data_dir), dry_run=True)
+        assert User.objects.count() == 0
+        assert Review.objects.count() == 0
+        assert 'review.csv: 3 строк' in capsys.readouterr().out
+
+    def test_missing_foreign_key(self, data_dir):
+        (data_dir / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '1,5,Отлично,1,10,2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8',
+        )
+        with pytest.raises(CommandError, match='строка 2'):
+            call_command('import_data', path=str(data_dir))
+        assert Review.objects.count() == 0
+
+    def test_copy_fills_not_null_defaults(self):
+        _, model, columns, _ = SOURCES[0]
+        sql, stream = copy_source(model, columns, iter([
+            [1, 'bingobongo', 'bingobongo@yamdb.fake', 'user', None, '', ''],
+        ]))
+        db_columns = sql[sql.index('(') + 1:sql.index(')')].split(', ')
+        assert db_columns[:7] == [
+            '"id"', '"username"', '"email"', '"role"', '"bio"',
+            '"first_name"', '"last_name"',
+        ]
+        assert set(db_columns[7:]) == {
+            '"password"', '"is_superuser"', '"is_staff"', '"is_active"',
+            '"date_joined"', '"token_version"',
+        }, 'Проверьте, что COPY заполняет NOT NULL поля вне файла'
+        row = dict(zip(db_columns, next(csv.reader(io.StringIO(
+            stream.read()
+        )))))
+        assert row['"bio"'] == r'\N'
+        assert (row['"is_active"'], row['"token_version"']) == ('True', '0')
+        assert row['"date_joined"'], 'Проверьте значение date_joined'
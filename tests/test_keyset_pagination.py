@@ -0,0 +1,72 @@
+import pytest
+from django.utils import timezone
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def title():
+    title = Title.objects.create(name='Произведение', year=2000)
+    authors = [
+        User.objects.create(username=f'user{i}', email=f'user{i}@ya.ru')
+        for i in range(7)
+    ]
+    for author in authors:
+        Review.objects.create(
+            title=title, author=author, text='Текст', score=5,
+        )
+    # Одинаковые даты проверяют разрешение совпадений по id.
+    Review.objects.filter(author__in=authors[2:5]).update(
+        pub_date=timezone.now(),
+    )
+    return title
+
+
+def walk(client, url):
+    ids = []
+    while url:
+        data = client.get(url).json()
+        assert 'count' not in data, (
+            'Проверьте, что курсорная пагинация не считает COUNT(*)'
+        )
+        ids.extend(item['id'] for item in data['results'])
+        url = data['next']
+    return ids
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    def test_reviews_cursor_walk(self, client, title):
+        ids = walk(client, f'/api/v1/titles/{title.id}/reviews/?cursor=&limit=3')
+        expected = list(
+            title.reviews.order_by('pub_date', 'id').values_list('id', flat=True)
+        )
+        assert ids == expected
+
+    def test_comments_cursor_walk(self, client, title):
+        review = title.reviews.first()
+        for author in User.objects.all()[:5]:
+            Comment.objects.create(review=review, author=author, text='Текст')
+        url = (
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            '?cursor=&limit=2'
+        )
+        assert walk(client, url) == list(
+            review.comments.order_by('pub_date', 'id').values_list(
+                'id', flat=True,
+            )
+        )
+
+    def test_limit_offset_still_works(self, client, title):
+        data = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?limit=3&offset=3'
+        ).json()
+        assert data['count'] == 7
+        assert len(data['results']) == 3
+
+    def test_invalid_cursor(self, client, title):
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=broken'
+        )
+        assert response.status_code == 404
@@ -0,0 +1,139 @@
+import pytest
+from reviews.leaderboard import (ALL, category_board, genre_board, rebuild,
+                                 refresh_titles, top)
+from reviews.models import Category, Genre, LeaderboardEntry, Review, Title
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def min_reviews(settings):
+    settings.LEADERBOARD_MIN_REVIEWS = 2
+
+
+@pytest.fixture
+def users():
+    return [
+        User.objects.create(username=f'user{i}', email=f'user{i}@ya.ru')
+        for i in range(4)
+    ]
+
+
+@pytest.fixture
+def titles(users):
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    data = (
+        ('popular', movie, [drama], (9, 9, 9, 10)),
+        ('single', movie, [comedy], (10,)),
+        ('book', None, [drama], (5, 5)),
+    )
+    titles = {}
+    for name, category, genres, scores in data:
+        title = Title.objects.create(name=name, year=2000, category=category)
+        title.genre.set(genres)
+        for user, score in zip(users, scores):
+            Review.objects.create(
+                title=title, author=user, text='Текст', score=score,
+            )
+        titles[name] = title
+    return titles
+
+
+def ranking(board):
+    return [entry.title.name for entry in top(board, 10)]
+
+
+def snapshot():
+    return sorted(
+        (entry.board, entry.title_id, round(entry.weighted_rating, 6))
+        for entry in LeaderboardEntry.objects.all()
+    )
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+
+    def test_weighted_rating(self, titles):
+        rebuild()
+        assert ranking(ALL) == ['popular', 'single', 'book'], (
+            'Проверьте, что одна оценка 10 не обгоняет много высоких оценок'
+        )
+        # C = 57 / 7, m = 2: (37 + 2·C) / (4 + 2).
+        entry = top(ALL, 1)[0]
+        assert entry.weighted_rating == pytest.approx((37 + 2 * 57 / 7) / 6)
+        assert entry.reviews_count == 4
+
+    def test_boards(self, titles):
+        rebuild()
+        movie = Category.objects.get(slug='movie')
+        drama = Genre.objects.get(slug='drama')
+        assert ranking(category_board(movie.pk)) == ['popular', 'single']
+        assert ranking(genre_board(drama.pk)) == ['popular', 'book']
+
+    def test_incremental_refresh(self, titles, users):
+        popular, single = titles['popular'], titles['single']
+        before = top(ALL, 1)[0].weighted_rating
+        review = Review.objects.get(title=popular, author=users[0])
+        review.score = 1
+        review.save()
+        assert LeaderboardEntry.objects.get(
+            board=ALL, title=popular,
+        ).weighted_rating < before, (
+            'Проверьте, что рейтинг обновляется при изменении отзыва'
+        )
+
+        single.reviews.all().delete()
+        assert not LeaderboardEntry.objects.filter(title=single).exists(), (
+            'Проверьте, что произведение без отзывов выбывает из рейтингов'
+        )
+
+        movie = Category.objects.get(slug='movie')
+        book = Title.objects.get(name='book')
+        book.category = movie
+        book.save()
+        assert 'book' in ranking(category_board(movie.pk))
+
+        book.genre.clear()
+        drama = Genre.objects.get(slug='drama')
+        assert ranking(genre_board(drama.pk)) == ['popular']
+
+    def test_delete_title(self, titles):
+        titles['popular'].delete()
+        assert not LeaderboardEntry.objects.filter(
+            title_id=titles['popular'].pk,
+        ).exists(), 'Проверьте удаление строк рейтингов вместе с произведением'
+
+    def test_rebuild_matches_refresh(self, titles):
+        rebuild()
+        rebuilt = snapshot()
+        LeaderboardEntry.objects.all().delete()
+        refresh_titles(Title.objects.values_list('pk', flat=True))
+        assert snapshot() == rebuilt
+
+
+@pytest.mark.django_db
+class TestLeaderboardView:
+
+    def test_top(self, client, titles):
+        rebuild()
+        url = '/api/v1/titles/top/'
+        data = client.get(url).json()
+        assert [item['title']['name'] for item in data] == [
+            'popular', 'single', 'book',
+        ]
+        assert data[0]['title']['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'},
+        ]
+        data = client.get(url, {'genre': 'drama', 'limit': 1}).json()
+        assert [item['title']['name'] for item in data] == ['popular']
+        data = client.get(url, {'category': 'movie'}).json()
+        assert [item['title']['name'] for item in data] == [
+            'popular', 'single',
+        ]
+
+    def test_top_errors(self, client, titles):
+        url = '/api/v1/titles/top/'
+        assert client.get(url, {'genre': 'unknown'}).status_code == 404
+        assert client.get(url, {'limit': 0}).status_code == 400
+        assert client.get(url, {'limit': 101}).status_code == 400
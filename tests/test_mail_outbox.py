@@ -0,0 +1,51 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from users.models import OutboxMessage
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db
+class TestMailOutbox:
+
+    def signup(self, client):
+        response = client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'newuser', 'email': 'newuser@ya.ru'},
+        )
+        assert response.status_code == 200
+
+    def test_signup_only_enqueues(self, client):
+        self.signup(client)
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо синхронно'
+        )
+        message = OutboxMessage.objects.get()
+        assert message.recipient == 'newuser@ya.ru'
+
+    def test_worker_sends_batch(self, client):
+        self.signup(client)
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newuser@ya.ru']
+        assert OutboxMessage.objects.get().sent_at is not None
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, 'Проверьте, что письмо не уходит дважды'
+
+    def test_failed_send_is_retried_later(self, client, settings):
+        self.signup(client)
+        settings.EMAIL_BACKEND = 'tests.test_mail_outbox.FailingBackend'
+        call_command('send_outbox')
+        message = OutboxMessage.objects.get()
+        assert message.sent_at is None
+        assert message.attempts == 1
+        assert 'SMTP' in message.last_error
+        call_command('send_outbox')
+        assert OutboxMessage.objects.get().attempts == 1, (
+            'Проверьте, что повтор откладывается до next_attempt_at'
+        )
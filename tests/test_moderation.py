@@ -0,0 +1,192 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from reviews.leaderboard import ALL
+from reviews.models import (ChangeLog, Comment, LeaderboardEntry, Review,
+                            SearchDocument, Title)
+from users.models import User
+
+URL = '/api/v1/moderation/'
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def moderator():
+    return client_for(User.objects.create(
+        username='moderator', email='moderator@ya.ru', role=User.MODERATOR,
+    ))
+
+
+@pytest.fixture
+def spammer():
+    return User.objects.create(username='spammer', email='spammer@ya.ru')
+
+
+@pytest.fixture
+def titles(spammer):
+    reader = User.objects.create(username='reader', email='reader@ya.ru')
+    titles = []
+    for i in range(3):
+        title = Title.objects.create(name=f'Произведение {i}', year=2000)
+        Review.objects.create(
+            title=title, author=reader, text='Честный отзыв', score=4,
+        )
+        review = Review.objects.create(
+            title=title, author=spammer, text='Спам', score=10,
+        )
+        Comment.objects.create(review=review, author=reader, text='Ответ')
+        Comment.objects.create(review=review, author=spammer, text='Спам')
+        titles.append(title)
+    return titles
+
+
+def spam_ids(spammer):
+    return list(
+        Review.objects.filter(author=spammer).values_list('pk', flat=True)
+    )
+
+
+def assert_counters(title, rating, reviews_count):
+    title.refresh_from_db()
+    assert title.rating == rating, 'Проверьте пересчёт рейтинга'
+    assert title.reviews_count == reviews_count
+    assert LeaderboardEntry.objects.get(
+        board=ALL, title=title,
+    ).reviews_count == reviews_count, 'Проверьте пересчёт рейтингов лучших'
+
+
+@pytest.mark.django_db
+class TestModeration:
+
+    def test_permissions(self, client, titles, spammer):
+        data = {'type': 'review', 'action': 'delete', 'ids': [1]}
+        assert client.post(URL, data).status_code == 401
+        assert client_for(spammer).post(
+            URL, data, format='json',
+        ).status_code == 403
+
+    def test_delete_by_ids(self, moderator, titles, spammer):
+        ids = spam_ids(spammer)
+        response = moderator.post(URL, {
+            'type': 'review', 'action': 'delete', 'ids': [*ids, 999999],
+        }, format='json')
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            *({'id': pk, 'status': 'deleted'} for pk in ids),
+            {'id': 999999, 'status': 'not_found'},
+        ]
+        assert not Review.objects.filter(pk__in=ids).exists()
+        assert not Comment.objects.filter(review_id__in=ids).exists(), (
+            'Проверьте удаление комментариев к удалённым отзывам'
+        )
+        assert not SearchDocument.objects.filter(
+            review_id__in=ids,
+        ).exists(), 'Проверьте очистку поискового индекса'
+        assert ChangeLog.objects.filter(
+            action=ChangeLog.DELETED, kind='review', object_id__in=ids,
+        ).count() == len(ids), 'Проверьте записи журнала изменений'
+        for title in titles:
+            assert_counters(title, 4, 1)
+
+    def test_queries_do_not_grow(self, moderator, titles, spammer):
+        ids = spam_ids(spammer)
+        counts = []
+        for part in (ids[:1], ids[1:]):
+            with CaptureQueriesContext(connection) as queries:
+                moderator.post(URL, {
+                    'type': 'review', 'action': 'hide', 'ids': part,
+                }, format='json')
+            counts.append(len(queries))
+        assert counts[0] == counts[1], (
+            'Число запросов не должно зависеть от числа объектов'
+        )
+
+    def test_hide_and_show_by_author(self, client, moderator, titles, spammer):
+        title = titles[0]
+        response = moderator.post(URL, {
+            'type': 'review', 'action': 'hide', 'author': 'spammer',
+        }, format='json')
+        assert {item['status'] for item in response.json()['results']} == {
+            'hidden',
+        }
+        reviews = client.get(f'/api/v1/titles/{title.id}/reviews/').json()
+        assert [item['text'] for item in reviews['results']] == [
+            'Честный отзыв',
+        ], 'Проверьте, что скрытые отзывы не выводятся'
+        review = Review.objects.get(title=title, author=spammer)
+        assert client.get(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        ).status_code == 404
+        assert_counters(title, 4, 1)
+        assert not SearchDocument.objects.filter(review=review).exists()
+
+        response = moderator.post(URL, {
+            'type': 'review', 'action': 'hide', 'ids': [review.id],
+        }, format='json')
+        assert response.json()['results'] == [
+            {'id': review.id, 'status': 'unchanged'},
+        ]
+        moderator.post(URL, {
+            'type': 'review', 'action': 'show', 'author': 'spammer',
+        }, format='json')
+        assert_counters(title, 7, 2)
+        assert SearchDocument.objects.filter(review=review).count() == 3, (
+            'Проверьте, что отзыв и комментарии вернулись в индекс'
+        )
+
+    def test_comments_by_time(self, client, moderator, titles, spammer):
+        since = timezone.now()
+        review = Review.objects.filter(author=spammer).first()
+        late = Comment.objects.create(
+            review=review, author=spammer, text='Поздний спам',
+        )
+        response = moderator.post(URL, {
+            'type': 'comment', 'action': 'hide', 'author': 'spammer',
+            'since': since.isoformat(),
+        }, format='json')
+        assert response.json()['results'] == [
+            {'id': late.id, 'status': 'hidden'},
+        ]
+        comments = client.get(
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/'
+        ).json()
+        assert 'Поздний спам' not in [
+            item['text'] for item in comments['results']
+        ]
+
+    def test_invalid(self, moderator, titles, settings):
+        response = moderator.post(
+            URL, {'type': 'review', 'action': 'delete'}, format='json',
+        )
+        assert response.status_code == 400
+        settings.MODERATION_MAX_OBJECTS = 2
+        response = moderator.post(URL, {
+            'type': 'comment', 'action': 'delete', 'author': 'spammer',
+        }, format='json')
+        assert response.status_code == 400
+        assert Comment.objects.count() == 6
+
+
+@pytest.mark.django_db
+class TestHiddenReviewRating:
+
+    def test_hide_single_review(self, titles, spammer):
+        title = titles[0]
+        review = Review.objects.get(title=title, author=spammer)
+        review.is_hidden = True
+        review.save()
+        assert_counters(title, 4, 1)
+        review.is_hidden = False
+        review.save()
+        assert_counters(title, 7, 2)
+        review.is_hidden = True
+        review.save()
+        review.delete()
+        assert_counters(title, 4, 1)
@@ -0,0 +1,87 @@
+import pytest
+from reviews.models import Comment, Review, Title
+from users.models import User
+from users.tokens import access_token_for
+
+
+@pytest.fixture
+def review():
+    title = Title.objects.create(name='Произведение', year=2000)
+    authors = [
+        User.objects.create(username=f'user{i}', email=f'user{i}@ya.ru')
+        for i in range(10)
+    ]
+    review = Review.objects.create(
+        title=title, author=authors[0], text='Текст', score=5,
+    )
+    for author in authors[1:]:
+        Review.objects.create(
+            title=title, author=author, text='Текст', score=7,
+        )
+        Comment.objects.create(review=review, author=author, text='Текст')
+    return review
+
+
+@pytest.mark.django_db
+class TestNestedQueries:
+
+    def test_reviews_page_queries(
+        self, client, review, django_assert_num_queries,
+    ):
+        # Произведение, валидатор ETag, COUNT(*) пагинатора, отзывы с авторами.
+        with django_assert_num_queries(4):
+            response = client.get(
+                f'/api/v1/titles/{review.title_id}/reviews/',
+            )
+        assert response.json()['count'] == 10
+        assert response.json()['results'][0]['author'].startswith('user')
+
+    def test_comments_page_queries(
+        self, client, review, django_assert_num_queries,
+    ):
+        # Отзыв, валидатор ETag, COUNT(*) пагинатора, комментарии с авторами.
+        with django_assert_num_queries(4):
+            response = client.get(
+                f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+                '/comments/'
+            )
+        results = response.json()['results']
+        assert len(results) == 9
+        assert {item['author'] for item in results} == {
+            f'user{i}' for i in range(1, 10)
+        }, 'Проверьте, что в комментарии выводится username автора'
+
+    def test_comments_of_missing_review(self, client, review):
+        response = client.get(
+            f'/api/v1/titles/{review.title_id}/reviews/0/comments/'
+        )
+        assert response.status_code == 404
+
+    def test_duplicate_review(self, client, review):
+        auth = {
+            'HTTP_AUTHORIZATION': f'Bearer {access_token_for(review.author)}'
+        }
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = client.post(url, {'text': 'Ещё', 'score': 1}, **auth)
+        assert response.status_code == 400, (
+            'Повторный отзыв на произведение должен возвращать 400'
+        )
+        assert response.json() == [
+            'Вы уже оставили отзыв на данное произведение.'
+        ]
+        title = Title.objects.get(pk=review.title_id)
+        assert title.reviews_count == 10, (
+            'Отклонённый отзыв не должен менять счётчики произведения'
+        )
+
+    def test_create_review_and_comment(self, client, review):
+        author = User.objects.create(username='new', email='new@ya.ru')
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {access_token_for(author)}'}
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = client.post(url, {'text': 'Новый', 'score': 9}, **auth)
+        assert response.status_code == 201
+        response = client.post(
+            f'{url}{review.id}/comments/', {'text': 'Новый'}, **auth,
+        )
+        assert response.status_code == 201
+        assert response.json()['author'] == 'new'
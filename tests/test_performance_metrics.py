@@ -0,0 +1,60 @@
+import logging
+import os
+import time
+
+import pytest
+from api.metrics import registry
+from api.serializers import ReviewSerializer
+from reviews.models import Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestPerformanceMetrics:
+
+    def test_metrics_per_view(self, client):
+        Title.objects.create(name='Фильм', year=2000)
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        response = client.get('/metrics/')
+        assert response.status_code == 200
+        text = response.content.decode()
+        labels = f'view="TitleViewSet.list",pid="{os.getpid()}"'
+        assert f'yamdb_request_duration_seconds_count{{{labels}}}' in text, (
+            'Проверьте, что серии помечены pid процесса'
+        )
+        assert f'yamdb_request_db_queries_total{{{labels}}}' in text
+        assert 'yamdb_response_cache_hits_total 1' in text
+
+    def test_serialization_time(self, client, monkeypatch):
+        title = Title.objects.create(name='Фильм', year=2000)
+        author = User.objects.create(username='author', email='author@ya.ru')
+        Review.objects.create(title=title, author=author, text='Да', score=5)
+        to_representation = ReviewSerializer.to_representation
+
+        def slow(self, instance):
+            time.sleep(0.05)
+            return to_representation(self, instance)
+
+        monkeypatch.setattr(ReviewSerializer, 'to_representation', slow)
+        metrics = registry.views['ReviewViewSet.list']
+        serialization, render = metrics.serialization_time, metrics.render_time
+        client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert metrics.serialization_time - serialization >= 0.05, (
+            'Время сериализации должно включать построение serializer.data'
+        )
+        assert metrics.render_time - render < 0.05
+        text = client.get('/metrics/').content.decode()
+        labels = f'view="ReviewViewSet.list",pid="{os.getpid()}"'
+        assert f'yamdb_request_render_seconds_total{{{labels}}}' in text
+
+    def test_metrics_are_internal(self, client):
+        response = client.get('/metrics/', REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == 404
+
+    def test_over_budget_request_is_logged(self, client, settings, caplog):
+        settings.PERFORMANCE_QUERY_BUDGET = 0
+        with caplog.at_level(logging.WARNING, 'api_yamdb.performance'):
+            client.get('/api/v1/genres/')
+        assert 'GenreViewSet.list' in caplog.text
+        assert 'SELECT' in caplog.text, 'Проверьте, что в лог попадает SQL'
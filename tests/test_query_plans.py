@@ -0,0 +1,87 @@
+import re
+
+import pytest
+from api.benchmark import SCALES, seed
+from django.db import connection, transaction
+from reviews.leaderboard import ALL, top
+from reviews.models import Category, ChangeLog, Comment, Genre, Review, Title
+from users.models import OutboxMessage, User
+
+
+def first(model):
+    return model.objects.order_by('pk').values_list('pk', flat=True)[0]
+
+
+HOT_QUERIES = {
+    'titles_by_name': lambda: Title.objects.filter(name='Произведение 1'),
+    'titles_by_year': lambda: Title.objects.filter(year=2000).order_by('pk'),
+    'titles_by_category': lambda: Title.objects.filter(
+        category__slug='bench-cat-0',
+    ),
+    'titles_by_genre': lambda: Title.objects.filter(
+        genre__slug='bench-genre-0',
+    ),
+    'reviews_page': lambda: Review.objects.filter(
+        title_id=first(Title),
+    ).order_by('pub_date', 'id')[:20],
+    'comments_page': lambda: Comment.objects.filter(
+        review_id=first(Review),
+    ).order_by('pub_date', 'id')[:20],
+    'leaderboard_top': lambda: top(ALL, 10),
+    'outbox_pending': lambda: OutboxMessage.objects.pending(5)[:100],
+    'changes_feed': lambda: ChangeLog.objects.committed().filter(
+        txid__gte=0,
+    ).order_by('txid', 'id')[:100],
+}
+# icontains обслуживают только триграммные индексы Postgres.
+TRIGRAM_QUERIES = {
+    'categories_search': lambda: Category.objects.filter(
+        name__icontains='катег',
+    ),
+    'genres_search': lambda: Genre.objects.filter(name__icontains='жанр'),
+    'users_search': lambda: User.objects.filter(username__icontains='ench'),
+}
+
+
+def explain(queryset):
+    """
+    План запроса. На Postgres последовательное чтение запрещается:
+    планировщик выберет его, только если подходящего индекса нет.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+
+def full_scans(plan):
+    if connection.vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    return re.findall(r'SCAN (?:TABLE )?(\w+)\b(?! USING)', plan)
+
+
+@pytest.fixture
+def seeded(db):
+    seed(SCALES['tiny'])
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+
+    @pytest.mark.parametrize('name', HOT_QUERIES)
+    def test_uses_index(self, seeded, name):
+        plan = explain(HOT_QUERIES[name]())
+        assert not full_scans(plan), (
+            f'Запрос {name} читает таблицу целиком:\n{plan}'
+        )
+
+    @pytest.mark.parametrize('name', TRIGRAM_QUERIES)
+    def test_trigram_index(self, seeded, name):
+        if connection.vendor != 'postgresql':
+            pytest.skip('Триграммные индексы есть только на Postgres')
+        plan = explain(TRIGRAM_QUERIES[name]())
+        assert not full_scans(plan), (
+            f'Запрос {name} читает таблицу целиком:\n{plan}'
+        )
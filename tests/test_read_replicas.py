@@ -0,0 +1,125 @@
+import time
+
+import pytest
+from api.cache import MODIFIED_KEY, bump_version, get_cache
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.test import APIClient
+from reviews.models import Category, Genre, GenreTitle, Title
+from users.models import User
+
+from api_yamdb.db.router import ReplicaRouter, use_replica
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(db, settings):
+    """Вторая база SQLite в памяти вместо реплики основной."""
+    connections.databases[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:',
+    }
+    settings.DATABASE_REPLICAS = [REPLICA]
+    connection = connections[REPLICA]
+    with connection.schema_editor() as editor:
+        for model in (Category, Genre, Title, GenreTitle):
+            editor.create_model(model)
+    # bulk_create без сигналов: они пишут производные данные в основную базу.
+    Title.objects.using(REPLICA).bulk_create([
+        Title(name='С реплики', year=2000),
+    ])
+    yield connection
+    connection.close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+@pytest.fixture
+def title():
+    return Title.objects.create(name='С основной базы', year=2000)
+
+
+def settle(resource):
+    """Последняя запись ресурса была давно: реплика её уже получила."""
+    get_cache().set(MODIFIED_KEY.format(resource), time.time() - 60, None)
+
+
+def title_names(client):
+    response = client.get('/api/v1/titles/')
+    assert response.status_code == 200
+    return [item['name'] for item in response.json()['results']]
+
+
+class TestReplicaRouter:
+
+    def test_routing(self, settings):
+        settings.DATABASE_REPLICAS = [REPLICA]
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) == 'default'
+        with use_replica() as alias:
+            assert alias == REPLICA
+            assert router.db_for_read(Title) == REPLICA
+            assert router.db_for_write(Title) == 'default', (
+                'Проверьте, что записи всегда идут в основную базу'
+            )
+        assert router.db_for_read(Title) == 'default'
+
+    def test_without_replicas(self, settings):
+        settings.DATABASE_REPLICAS = []
+        with use_replica():
+            assert ReplicaRouter().db_for_read(Title) == 'default'
+
+
+@pytest.mark.django_db
+class TestReplicaReads:
+
+    def test_reads_from_replica(self, client, replica, title):
+        settle('titles')
+        assert title_names(client) == ['С реплики'], (
+            'Проверьте, что GET к произведениям читает с реплики'
+        )
+
+    def test_read_your_writes(self, replica, title):
+        user = User.objects.create(username='author', email='author@ya.ru')
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            {'text': 'Текст', 'score': 7},
+        )
+        assert response.status_code == 201
+        assert title_names(client) == ['С основной базы'], (
+            'Проверьте, что после записи автор читает с основной базы'
+        )
+        # Без куки закрепление находится по пользователю в кэше.
+        other_client = APIClient()
+        other_client.force_authenticate(user)
+        assert title_names(other_client) == ['С основной базы']
+        # Ответ основной базы кэшируется; без кэша аноним читает реплику.
+        cache.clear()
+        settle('titles')
+        assert title_names(APIClient()) == ['С реплики']
+
+    def test_validators_after_recent_write(self, client, replica, title):
+        bump_version('titles')
+        response = client.get('/api/v1/titles/')
+        assert [item['name'] for item in response.json()['results']] == [
+            'С основной базы',
+        ], 'Сразу после записи ответ с ETag читается с основной базы'
+        response = client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        assert response.status_code == 304
+
+    def test_post_batch_reads_replica(self, client, replica, title):
+        replica_id = Title.objects.using(REPLICA).get().pk
+        response = client.post(
+            '/api/v1/titles/batch/', {'ids': [replica_id]},
+            content_type='application/json',
+        )
+        assert [item['name'] for item in response.json()['results']] == [
+            'С реплики',
+        ], 'Проверьте, что POST /titles/batch/ читает с реплики'
+        assert 'read_primary' not in response.cookies, (
+            'Проверьте, что чтение через POST не закрепляет за основной базой'
+        )
@@ -0,0 +1,107 @@
+import pytest
+from api.cache import cache_stats
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from reviews.models import Category, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def admin_client():
+    admin = User.objects.create(
+        username='admin', email='admin@ya.ru', role=User.ADMIN,
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    def test_repeated_get_is_served_from_cache(
+        self, client, django_assert_num_queries,
+    ):
+        Category.objects.create(name='Фильмы', slug='movies')
+        first = client.get('/api/v1/categories/')
+        assert first['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            second = client.get('/api/v1/categories/')
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+        assert cache_stats() == {'hits': 1, 'misses': 1}
+
+    def test_query_params_are_part_of_key(self, client):
+        Category.objects.create(name='Фильмы', slug='movies')
+        client.get('/api/v1/categories/?search=Фильмы')
+        response = client.get('/api/v1/categories/?search=Книги')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 0
+
+    def test_write_bumps_version(self, client, admin_client):
+        client.get('/api/v1/categories/')
+        response = admin_client.post(
+            '/api/v1/categories/', {'name': 'Книги', 'slug': 'books'},
+        )
+        assert response.status_code == 201
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что запись сбрасывает кэш ресурса'
+        )
+        assert response.json()['count'] == 1
+
+    def test_category_delete_invalidates_titles(self, client, admin_client):
+        category = Category.objects.create(name='Фильмы', slug='movies')
+        title = Title.objects.create(name='Фильм', year=2000, category=category)
+        client.get(f'/api/v1/titles/{title.id}/')
+        admin_client.delete('/api/v1/categories/movies/')
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['category'] is None
+
+    def test_review_invalidates_title_rating(self, client):
+        title = Title.objects.create(name='Фильм', year=2000)
+        client.get(f'/api/v1/titles/{title.id}/')
+        author = User.objects.create(username='author', email='a@ya.ru')
+        author_client = APIClient()
+        author_client.force_authenticate(author)
+        author_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            {'text': 'Текст', 'score': 8},
+        )
+        assert Review.objects.count() == 1
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['rating'] == 8
+
+    def test_cascade_delete_invalidates_title_rating(
+        self, client, admin_client,
+    ):
+        title = Title.objects.create(name='Фильм', year=2000)
+        author = User.objects.create(username='author', email='a@ya.ru')
+        Review.objects.create(
+            title=title, author=author, text='Текст', score=10,
+        )
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{title.id}/'):
+            client.get(url)
+        response = admin_client.delete('/api/v1/users/author/')
+        assert response.status_code == 204
+        assert client.get('/api/v1/titles/').json()['results'][0][
+            'rating'
+        ] is None, 'Проверьте сброс кэша списка после каскадного удаления'
+        assert client.get(
+            f'/api/v1/titles/{title.id}/'
+        ).json()['rating'] is None
+
+    def test_rebuild_ratings_invalidates_titles(self, client):
+        title = Title.objects.create(name='Фильм', year=2000)
+        author = User.objects.create(username='author', email='a@ya.ru')
+        # bulk_create обходит сигналы, как импорт данных.
+        Review.objects.bulk_create([
+            Review(title=title, author=author, text='Текст', score=6),
+        ])
+        client.get(f'/api/v1/titles/{title.id}/')
+        call_command('rebuild_ratings')
+        assert client.get(
+            f'/api/v1/titles/{title.id}/'
+        ).json()['rating'] == 6, (
+            'Проверьте сброс кэша после пересчёта рейтингов'
+        )
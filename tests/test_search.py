@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+from reviews.models import Comment, Review, SearchDocument, Title
+from users.models import User
+
+
+@pytest.fixture
+def catalog():
+    author = User.objects.create(username='author', email='author@ya.ru')
+    matrix = Title.objects.create(
+        name='Матрица', year=1999, description='Фильм про виртуальный мир',
+    )
+    other = Title.objects.create(name='Мир Дикого Запада', year=2016)
+    review = Review.objects.create(
+        title=other, author=author, score=8,
+        text='Виртуальный мир, андроиды и снова виртуальный мир, мир',
+    )
+    Comment.objects.create(
+        review=review, author=author, text='Согласен про виртуальный мир',
+    )
+    return matrix, other, review
+
+
+@pytest.mark.django_db
+class TestSearch:
+
+    def test_ranked_results(self, client, catalog):
+        matrix, other, review = catalog
+        data = client.get(
+            '/api/v1/search/', {'q': 'виртуальный мир'},
+        ).json()
+        found = [(item['type'], item['id']) for item in data['results']]
+        assert set(found) == {
+            ('title', matrix.id), ('review', review.id),
+            ('comment', Comment.objects.get().id),
+        }
+        assert found[0] == ('review', review.id), (
+            'Проверьте ранжирование результатов'
+        )
+        assert data['results'][0]['title_id'] == other.id
+
+    def test_cursor_walk(self, client, catalog):
+        data = client.get('/api/v1/search/', {'q': 'мир', 'limit': 1}).json()
+        ids = [(item['type'], item['id']) for item in data['results']]
+        url = data['next']
+        while url:
+            data = client.get(url).json()
+            ids.extend((item['type'], item['id']) for item in data['results'])
+            url = data['next']
+        assert len(ids) == len(set(ids)) == 4
+
+    def test_index_follows_deletes(self, client, catalog):
+        matrix, other, review = catalog
+        other.delete()
+        data = client.get('/api/v1/search/', {'q': 'мир'}).json()
+        assert [item['id'] for item in data['results']] == [matrix.id]
+
+    def test_empty_query(self, client):
+        assert client.get('/api/v1/search/?q=').status_code == 400
+
+    def test_rebuild_command(self, catalog):
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index')
+        assert SearchDocument.objects.count() == 4
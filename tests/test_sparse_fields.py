@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def title():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    author = User.objects.create(
+        username='author', email='author@ya.ru', first_name='Иван',
+    )
+    title = Title.objects.create(
+        name='Произведение', year=2000, category=category,
+        description='Длинное описание',
+    )
+    title.genre.set([genre])
+    review = Review.objects.create(
+        title=title, author=author, text='Текст', score=8,
+    )
+    Comment.objects.create(review=review, author=author, text='Комментарий')
+    return title
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    def test_titles_fields(self, client, title, django_assert_num_queries):
+        # COUNT(*) пагинатора и выборка без жанров и категории.
+        with django_assert_num_queries(2):
+            response = client.get('/api/v1/titles/', {'fields': 'id,name'})
+        assert response.json()['results'] == [
+            {'id': title.id, 'name': 'Произведение'}
+        ]
+
+    def test_titles_only_requested_columns(self, client, title):
+        with CaptureQueriesContext(connection) as captured:
+            client.get('/api/v1/titles/', {'fields': 'id,name'})
+        select = captured.captured_queries[-1]['sql']
+        assert 'description' not in select, (
+            'Проверьте, что выборка ограничена запрошенными полями'
+        )
+        assert 'rating' not in select
+
+    def test_titles_collapsed_relations(self, client, title):
+        response = client.get(
+            f'/api/v1/titles/{title.id}/',
+            {'fields': 'id,category,genre', 'expand': ''},
+        )
+        assert response.json() == {
+            'id': title.id, 'category': 'movie', 'genre': ['drama'],
+        }
+
+    def test_titles_expanded_by_default(self, client, title):
+        data = client.get(
+            '/api/v1/titles/', {'fields': 'category,genre'},
+        ).json()['results'][0]
+        assert data == {
+            'category': {'name': 'Фильм', 'slug': 'movie'},
+            'genre': [{'name': 'Драма', 'slug': 'drama'}],
+        }
+
+    def test_full_response_unchanged(self, client, title):
+        data = client.get('/api/v1/titles/').json()['results'][0]
+        assert set(data) == {
+            'id', 'name', 'year', 'description', 'category', 'genre',
+            'rating',
+        }
+
+    def test_unknown_fields(self, client, title):
+        for params in ({'fields': 'id,secret'}, {'expand': 'reviews'}):
+            response = client.get('/api/v1/titles/', params)
+            assert response.status_code == 400
+
+    def test_reviews_expand_author(self, client, title):
+        data = client.get(
+            f'/api/v1/titles/{title.id}/reviews/',
+            {'fields': 'id,author', 'expand': 'author'},
+        ).json()['results'][0]
+        assert data['author'] == {
+            'username': 'author', 'first_name': 'Иван', 'last_name': None,
+        }
+        assert set(data) == {'id', 'author'}
+
+    def test_comments_fields(self, client, title, django_assert_num_queries):
+        review = title.reviews.get()
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        client.get(url)
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url, {'fields': 'id,text', 'cursor': ''})
+        assert response.json()['results'] == [
+            {'id': review.comments.get().id, 'text': 'Комментарий'}
+        ]
+        assert 'username' not in captured.captured_queries[-1]['sql'], (
+            'Проверьте, что автор не подгружается, если не запрошен'
+        )
@@ -0,0 +1,72 @@
+import pytest
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from reviews.models import Category
+from users.models import User
+
+
+@pytest.fixture
+def user(client):
+    client.post(
+        '/api/v1/auth/signup/',
+        {'username': 'reader', 'email': 'reader@ya.ru'},
+    )
+    return User.objects.get(username='reader')
+
+
+def get_token(client, user):
+    response = client.post('/api/v1/auth/token/', {
+        'username': user.username,
+        'confirmation_code': PasswordResetTokenGenerator().make_token(user),
+    })
+    assert response.status_code == 200
+    return response.json().split('token: ')[1]
+
+
+@pytest.mark.django_db
+class TestStatelessJWT:
+
+    def test_request_does_not_load_user(
+        self, client, user, django_assert_num_queries,
+    ):
+        token = get_token(client, user)
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        Category.objects.create(name='Фильмы', slug='movies')
+        client.get('/api/v1/categories/', **auth)
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/categories/', **auth)
+        assert response.status_code == 200
+
+    def test_me_with_claims_user(self, client, user):
+        token = get_token(client, user)
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        assert response.status_code == 200
+        assert response.json()['username'] == 'reader'
+
+    def test_role_change_revokes_token(self, client, user):
+        token = get_token(client, user)
+        user = User.objects.get(pk=user.pk)
+        user.role = User.MODERATOR
+        user.save()
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        assert response.status_code == 401, (
+            'Проверьте, что смена роли отзывает выданные токены'
+        )
+        token = get_token(client, user)
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        assert response.json()['role'] == User.MODERATOR
+
+    def test_deactivation_revokes_token(self, client, user):
+        token = get_token(client, user)
+        user = User.objects.get(pk=user.pk)
+        user.is_active = False
+        user.save()
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        assert response.status_code == 401
@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from api import throttling
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from users.models import User
+
+URL = '/api/v1/auth/signup/'
+NGINX_CONF = Path(__file__).parents[1] / 'infra' / 'nginx' / 'default.conf'
+
+
+@pytest.fixture(autouse=True)
+def rates(settings):
+    settings.THROTTLE_RATES = {
+        'signup': {'anon': '2/min', 'user': '3/min', 'admin': None},
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(throttling.time, 'time', lambda: now[0])
+    return now
+
+
+def signup(client, **extra):
+    return client.post(URL, {'username': 'bot', 'email': 'bot@ya.ru'}, **extra)
+
+
+def client_for(role):
+    user = User.objects.create(
+        username=role, email=f'{role}@ya.ru', role=role,
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.mark.django_db
+class TestTokenBucketThrottle:
+
+    def test_anonymous_limit(self, client, clock):
+        assert signup(client).status_code == 200
+        assert signup(client).status_code == 200
+        response = signup(client)
+        assert response.status_code == 429, (
+            'Проверьте ограничение регистраций для анонимного пользователя'
+        )
+        assert response['Retry-After'] == '30', (
+            'Проверьте заголовок Retry-After: до нового токена 30 секунд'
+        )
+        assert signup(client, REMOTE_ADDR='10.0.0.2').status_code == 200, (
+            'Проверьте, что у каждого IP-адреса своя корзина'
+        )
+
+    def test_spoofed_forwarded_for(self, client, clock):
+        statuses = [
+            signup(
+                client, HTTP_X_FORWARDED_FOR=f'10.9.9.{i}, 203.0.113.7',
+            ).status_code
+            for i in range(5)
+        ]
+        assert statuses.count(429) == 3, (
+            'Проверьте, что подмена X-Forwarded-For не обходит лимит'
+        )
+        assert 'proxy_set_header X-Forwarded-For $remote_addr;' in (
+            NGINX_CONF.read_text()
+        ), 'nginx должен заменять X-Forwarded-For адресом клиента'
+
+    def test_refill(self, client, clock):
+        for _ in range(2):
+            signup(client)
+        clock[0] += 20
+        response = signup(client)
+        assert response.status_code == 429
+        assert response['Retry-After'] == '10'
+        clock[0] += 10
+        assert signup(client).status_code == 200, (
+            'Проверьте пополнение корзины со временем'
+        )
+
+    def test_roles(self, clock):
+        client = client_for(User.USER)
+        statuses = [signup(client).status_code for _ in range(4)]
+        assert statuses.count(429) == 1, 'Проверьте лимит для роли user'
+        client = client_for(User.ADMIN)
+        assert all(
+            signup(client).status_code != 429 for _ in range(10)
+        ), 'Проверьте, что лимит None отключает ограничение'
+
+    def test_concurrent_requests(self, clock):
+        view = SimpleNamespace(throttle_scope='signup')
+
+        def allow(_):
+            request = Request(APIRequestFactory().post(URL))
+            request.user = AnonymousUser()
+            return throttling.TokenBucketThrottle().allow_request(
+                request, view,
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            allowed = list(executor.map(allow, range(16)))
+        assert allowed.count(True) == 2, (
+            'Одновременные запросы должны списывать токены из одной корзины'
+        )
+
+    def test_parse_rate(self):
+        assert throttling.parse_rate('10/min') == (10, 60)
+        assert throttling.parse_rate('100/hour') == (100, 3600)
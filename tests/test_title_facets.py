@@ -0,0 +1,95 @@
+import pytest
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def titles():
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    book = Category.objects.create(name='Книга', slug='book')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    data = (
+        (1994, movie, [drama]),
+        (1999, movie, [drama, comedy]),
+        (2003, book, [comedy]),
+        (2010, None, []),
+    )
+    for year, category, genres in data:
+        title = Title.objects.create(
+            name=f'Произведение {year}', year=year, category=category,
+        )
+        title.genre.set(genres)
+    return movie
+
+
+@pytest.mark.django_db
+class TestTitleFacets:
+
+    def test_facets(self, client, titles, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/titles/facets/')
+        assert response.json() == {
+            'genre': [
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+                {'slug': 'drama', 'name': 'Драма', 'count': 2},
+            ],
+            'category': [
+                {'slug': 'book', 'name': 'Книга', 'count': 1},
+                {'slug': 'movie', 'name': 'Фильм', 'count': 2},
+            ],
+            'year': [
+                {'from': 1990, 'to': 1999, 'count': 2},
+                {'from': 2000, 'to': 2009, 'count': 1},
+                {'from': 2010, 'to': 2019, 'count': 1},
+            ],
+        }
+
+    def test_facets_with_filter(self, client, titles):
+        data = client.get(
+            '/api/v1/titles/facets/', {'genre': 'drama', 'year_bucket': 5},
+        ).json()
+        assert data['genre'] == [
+            {'slug': 'comedy', 'name': 'Комедия', 'count': 1},
+            {'slug': 'drama', 'name': 'Драма', 'count': 2},
+        ], 'Проверьте, что фасеты учитывают параметры TitleFilter'
+        assert data['category'] == [
+            {'slug': 'movie', 'name': 'Фильм', 'count': 2},
+        ]
+        assert data['year'] == [
+            {'from': 1990, 'to': 1994, 'count': 1},
+            {'from': 1995, 'to': 1999, 'count': 1},
+        ]
+
+    def test_deleted_genre(self, client, titles):
+        Genre.objects.get(slug='comedy').delete()
+        response = client.get('/api/v1/titles/facets/')
+        assert response.status_code == 200, (
+            'Проверьте фасеты при связях с удалённым жанром'
+        )
+        assert response.json()['genre'] == [
+            {'slug': 'drama', 'name': 'Драма', 'count': 2},
+        ]
+
+    def test_invalid_bucket(self, client, titles):
+        response = client.get('/api/v1/titles/facets/', {'year_bucket': 0})
+        assert response.status_code == 400
+
+    def test_cached(self, client, titles, django_assert_num_queries):
+        client.get('/api/v1/titles/facets/')
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/facets/')
+        assert response['X-Cache'] == 'HIT'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalidated_on_changes(self, client, titles):
+        client.get('/api/v1/titles/facets/')
+        title = Title.objects.create(name='Новое', year=2011, category=titles)
+        data = client.get('/api/v1/titles/facets/').json()
+        assert data['year'][-1]['count'] == 2, (
+            'Проверьте, что новое произведение сбрасывает кэш фасетов'
+        )
+        title.genre.set(Genre.objects.filter(slug='drama'))
+        data = client.get('/api/v1/titles/facets/').json()
+        assert data['genre'][1] == {
+            'slug': 'drama', 'name': 'Драма', 'count': 3,
+        }, 'Проверьте, что изменение жанров сбрасывает кэш фасетов'
@@ -0,0 +1,136 @@
+import pytest
+from api.views import ReviewViewSet
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIClient
+from reviews.models import Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def title():
+    return Title.objects.create(name='Произведение', year=2000)
+
+
+@pytest.fixture
+def users():
+    return [
+        User.objects.create(username=f'user{i}', email=f'user{i}@ya.ru')
+        for i in range(3)
+    ]
+
+
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def assert_rating(title, rating, reviews_count, score_sum):
+    title.refresh_from_db()
+    assert title.rating == rating, 'Проверьте пересчёт рейтинга'
+    assert title.reviews_count == reviews_count, (
+        'Проверьте пересчёт количества отзывов'
+    )
+    assert title.score_sum == score_sum, 'Проверьте пересчёт суммы оценок'
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_review_create_update_delete(self, title, users):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        for user, score in zip(users, (10, 5, 3)):
+            response = api_client(user).post(
+                url, {'text': 'Текст', 'score': score},
+            )
+            assert response.status_code == 201
+        assert_rating(title, 6, 3, 18)
+
+        review = Review.objects.get(author=users[0])
+        response = api_client(users[0]).patch(
+            f'{url}{review.id}/', {'score': 1},
+        )
+        assert response.status_code == 200
+        assert_rating(title, 3, 3, 9)
+
+        response = api_client(users[0]).delete(f'{url}{review.id}/')
+        assert response.status_code == 204
+        assert_rating(title, 4, 2, 8)
+
+        response = api_client(users[1]).get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['rating'] == 4
+        assert 'score_sum' not in response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_update_locks_review(self, title, users, monkeypatch):
+        review = Review.objects.create(
+            title=title, author=users[0], text='Текст', score=10,
+        )
+        locks = []
+        get_object = ReviewViewSet.get_object
+
+        def spy(view):
+            locks.append((
+                view.get_queryset().query.select_for_update,
+                connection.in_atomic_block,
+            ))
+            return get_object(view)
+
+        monkeypatch.setattr(ReviewViewSet, 'get_object', spy)
+        response = api_client(users[0]).patch(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/', {'score': 4},
+        )
+        assert response.status_code == 200
+        assert locks == [(True, True)], (
+            'Проверьте, что отзыв читается для правки под блокировкой строки '
+            'в транзакции сохранения'
+        )
+        assert_rating(title, 4, 1, 4)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_delete_locks_review(self, title, users, monkeypatch):
+        for user, score in zip(users, (10, 4)):
+            Review.objects.create(
+                title=title, author=user, text='Текст', score=score,
+            )
+        review = Review.objects.get(author=users[0])
+        locks = []
+        get_object = ReviewViewSet.get_object
+
+        def spy(view):
+            locks.append((
+                view.get_queryset().query.select_for_update,
+                connection.in_atomic_block,
+            ))
+            return get_object(view)
+
+        monkeypatch.setattr(ReviewViewSet, 'get_object', spy)
+        response = api_client(users[0]).delete(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/',
+        )
+        assert response.status_code == 204
+        assert locks == [(True, True)], (
+            'Проверьте, что удаляемый отзыв читается под блокировкой строки '
+            'в транзакции удаления'
+        )
+        assert_rating(title, 4, 1, 4)
+
+    def test_cascade_delete(self, title, users):
+        for user, score in zip(users, (10, 5, 3)):
+            Review.objects.create(
+                title=title, author=user, text='Текст', score=score,
+            )
+        users[0].delete()
+        assert_rating(title, 4, 2, 8)
+        User.objects.all().delete()
+        assert_rating(title, None, 0, 0)
+
+    def test_rebuild_ratings_command(self, title, users):
+        for user, score in zip(users, (10, 5, 3)):
+            Review.objects.create(
+                title=title, author=user, text='Текст', score=score,
+            )
+        Title.objects.update(rating=None, reviews_count=0, score_sum=0)
+        call_command('rebuild_ratings')
+        assert_rating(title, 6, 3, 18)
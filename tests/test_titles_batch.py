@@ -0,0 +1,82 @@
+import pytest
+from api.views import TitleViewSet
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+URL = '/api/v1/titles/batch/'
+
+
+@pytest.fixture
+def titles():
+    author = User.objects.create(username='author', email='author@ya.ru')
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(3)
+    ]
+    titles = []
+    for i in range(60):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000,
+            category=category if i % 2 else None,
+        )
+        title.genre.set(genres[i % 3:])
+        if i % 3:
+            Review.objects.create(
+                title=title, author=author, text='Текст', score=i % 10 + 1,
+            )
+        titles.append(title)
+    # Связи удалённого жанра остаются с genre = NULL.
+    genres[1].delete()
+    return titles
+
+
+def ids_param(ids):
+    return {'ids': ','.join(str(pk) for pk in ids)}
+
+
+@pytest.mark.django_db
+class TestTitlesBatch:
+
+    def test_order_and_missing(self, client, titles):
+        ids = [titles[5].pk, 999999, titles[1].pk, titles[5].pk, titles[3].pk]
+        data = client.get(URL, ids_param(ids)).json()
+        assert [item['id'] for item in data['results']] == [
+            titles[5].pk, titles[1].pk, titles[3].pk,
+        ], 'Проверьте, что порядок id сохраняется, а повторы отброшены'
+        assert data['missing'] == [999999]
+        for item in data['results']:
+            assert item == client.get(
+                f'/api/v1/titles/{item["id"]}/'
+            ).json(), 'Проверьте, что произведение выводится как в /titles/id/'
+
+    def test_post(self, client, titles):
+        ids = [title.pk for title in reversed(titles)]
+        response = client.post(
+            URL, {'ids': ids}, content_type='application/json',
+        )
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()['results']] == ids
+
+    def test_matches_serializer(self, client, monkeypatch, titles):
+        params = ids_param([title.pk for title in titles[::-1]])
+        fast = client.get(URL, params).content
+        monkeypatch.setattr(TitleViewSet, 'fast_list', False)
+        assert client.get(URL, params).content == fast
+
+    @pytest.mark.parametrize('count', (3, 60))
+    def test_queries(
+        self, client, titles, count, django_assert_num_queries,
+    ):
+        # Произведения с категориями и жанры всех произведений.
+        with django_assert_num_queries(2):
+            response = client.get(
+                URL, ids_param(title.pk for title in titles[:count]),
+            )
+        assert len(response.json()['results']) == count
+
+    def test_invalid_ids(self, client, titles):
+        assert client.get(URL).status_code == 400
+        assert client.get(URL, {'ids': '1,abc'}).status_code == 400
+        too_many = ids_param(range(1, TitleViewSet.batch_max_size + 2))
+        assert client.get(URL, too_many).status_code == 400
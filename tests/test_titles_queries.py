@@ -0,0 +1,65 @@
+import pytest
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def titles():
+    author = User.objects.create(username='author', email='author@ya.ru')
+    categories = [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(3)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(3)
+    ]
+    titles = []
+    for i in range(12):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000 + i % 2,
+            category=categories[i % 3],
+        )
+        title.genre.set(genres[:i % 3 + 1])
+        Review.objects.create(
+            title=title, author=author, text='Текст', score=i % 10 + 1,
+        )
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db
+class TestTitleQueries:
+    # COUNT(*) пагинатора, выборка произведений, prefetch жанров.
+    list_queries = 3
+
+    def test_list_queries(self, client, titles, django_assert_num_queries):
+        with django_assert_num_queries(self.list_queries):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert response.json()['count'] == len(titles)
+
+    def test_list_queries_do_not_depend_on_page_size(
+        self, client, titles, django_assert_num_queries,
+    ):
+        for limit in (1, 5, 12):
+            with django_assert_num_queries(self.list_queries):
+                response = client.get(f'/api/v1/titles/?limit={limit}')
+            assert len(response.json()['results']) == limit, (
+                'Проверьте, что параметр limit ограничивает выдачу'
+            )
+
+    def test_filtered_list_queries(
+        self, client, titles, django_assert_num_queries,
+    ):
+        with django_assert_num_queries(self.list_queries):
+            response = client.get('/api/v1/titles/?genre=genre-0&year=2000')
+        assert response.json()['count'] == 6
+
+    def test_retrieve_queries(self, client, titles, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[5].id}/')
+        data = response.json()
+        assert data['category']['slug'] == 'category-2'
+        assert len(data['genre']) == 3
+        assert data['rating'] == 6